@@ -8,6 +8,8 @@ from django.utils.translation import gettext_lazy as _
 from api.models.user import User
 from api.models.wallet import Wallet
 from api.models.transaction import Transaction
+from api.models.exchange_rate import ExchangeRate
+from api.models.settlement_import import SettlementImport
 
 
 
@@ -37,4 +39,16 @@ class WalletAdmin(admin.ModelAdmin):
     readonly_fields = ('wallet_address',)
 
 
-admin.site.register(Transaction)
\ No newline at end of file
+admin.site.register(Transaction)
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ('currency', 'mid', 'effective_date', 'table_number')
+    list_filter = ('table', 'currency')
+
+
+@admin.register(SettlementImport)
+class SettlementImportAdmin(admin.ModelAdmin):
+    list_display = ('filename', 'lines_processed', 'lines_rejected', 'started_at', 'completed_at')
+    readonly_fields = ('checksum',)
@@ -6,4 +6,6 @@ class ApiConfig(AppConfig):
     name = 'api'
 
     def ready(self):
-        import api.signals.wallet_signals
\ No newline at end of file
+        import api.signals.wallet_signals
+        import api.signals.token_signals
+        import api.signals.user_signals
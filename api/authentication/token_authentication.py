@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+
+# Shared by the workers, so dropping an entry takes effect everywhere at once
+cache = ConnectionProxy(caches, 'shared')
+
+
+def token_cache_key(key):
+    return f'auth-token:{key}'
+
+
+def token_queryset():
+    return Token.objects.select_related('user').defer('user__password')
+
+
+def get_token(key):
+    """
+    Return the Token with ``key`` and its user, from the cache when possible.
+    Returns None for unknown keys, which aren't cached.
+
+    The user's password hash is deferred, so it never ends up in the cache; it is
+    loaded on first access, e.g. by check_password().
+    """
+    token = cache.get(token_cache_key(key))
+    if token is None:
+        token = token_queryset().filter(key=key).first()
+        if token is not None:
+            cache.set(token_cache_key(key), token, settings.TOKEN_CACHE_TTL)
+    return token
+
+
+async def aget_token(key):
+    """Async variant of get_token, for the async views."""
+
+    token = await cache.aget(token_cache_key(key))
+    if token is None:
+        token = await token_queryset().filter(key=key).afirst()
+        if token is not None:
+            await cache.aset(token_cache_key(key), token, settings.TOKEN_CACHE_TTL)
+    return token
+
+
+def invalidate_user_tokens(user):
+    """Drop the cached tokens of ``user``, so the next request sees its current state."""
+
+    keys = Token.objects.filter(user=user).values_list('key', flat=True)
+    cache.delete_many([token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+
+    """
+    Token authentication that caches the token -> user lookup for TOKEN_CACHE_TTL seconds.
+
+    Saves the Token + User query on every request. Cached entries are dropped when
+    the token is deleted (logout) and whenever the user is saved (password change,
+    deactivation), see api.signals.token_signals. Changes made with QuerySet.update()
+    bypass those signals and show up once the entry expires.
+    """
+
+    def authenticate_credentials(self, key):
+        token = get_token(key)
+        if token is None:
+            raise AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
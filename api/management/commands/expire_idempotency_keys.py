@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.utils.idempotency import expire
+
+
+class Command(BaseCommand):
+
+    """Deletes stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL, meant to run periodically."""
+
+    help = 'Delete expired idempotency keys in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ttl', type=int, default=settings.IDEMPOTENCY_KEY_TTL, help='Age in seconds after which keys expire')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Keys deleted per query')
+
+    def handle(self, *args, **options):
+        deleted = expire(ttl=options['ttl'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired idempotency keys'))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.fake_nbp_server import FakeNBPServer
+
+
+class Command(BaseCommand):
+
+    """Runs a local stand-in for the NBP API with injectable latency and failures."""
+
+    help = 'Serve a fake NBP exchange rate API. Point NBP_API_URL at the printed URL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8001)
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+        parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random seconds')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='Share of requests answered with 503')
+        parser.add_argument('--truncate-rate', type=float, default=0.0, help='Share of responses cut off mid-body')
+
+    def handle(self, *args, **options):
+        server = FakeNBPServer(
+            host=options['host'],
+            port=options['port'],
+            latency=options['latency'],
+            jitter=options['jitter'],
+            failure_rate=options['failure_rate'],
+            truncate_rate=options['truncate_rate'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Fake NBP API listening on {server.url}'))
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
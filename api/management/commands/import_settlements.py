@@ -0,0 +1,63 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.models.settlement_import import SettlementImport
+from api.utils.settlements import SETTLEMENT_COLUMNS, apply_chunk, chunked, file_checksum, read_lines
+
+
+class Command(BaseCommand):
+
+    """Streams a bank settlement CSV into wallet balances and Transaction rows, chunk by chunk."""
+
+    help = (
+        f'Import a bank settlement CSV with the columns {", ".join(SETTLEMENT_COLUMNS)}. '
+        'Running it again on the same file resumes after the last committed chunk.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Settlement CSV file')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Lines applied per database transaction')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'{path} does not exist')
+
+        settlement, created = SettlementImport.objects.get_or_create(
+            checksum=file_checksum(path),
+            defaults={'filename': path.name},
+        )
+        if settlement.completed_at:
+            self.stdout.write(f'{path.name} was already imported on {settlement.completed_at:%Y-%m-%d %H:%M}')
+            return
+        if not created:
+            self.stdout.write(f'Resuming {path.name}: {settlement.lines_processed} lines were already imported')
+
+        started = time.perf_counter()
+        processed = 0
+
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            try:
+                lines = read_lines(f, skip=settlement.lines_processed)
+                for chunk in chunked(lines, options['chunk_size']):
+                    for line_number, reason in apply_chunk(settlement, chunk):
+                        self.stderr.write(f'line {line_number}: {reason}')
+
+                    processed += len(chunk)
+                    self.stdout.write(
+                        f'{settlement.lines_processed} lines processed, {settlement.lines_rejected} rejected '
+                        f'({processed / (time.perf_counter() - started):.0f} lines/s)'
+                    )
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        settlement.completed_at = timezone.now()
+        settlement.save(update_fields=['completed_at'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {path.name}: {settlement.lines_processed - settlement.lines_rejected} lines applied, '
+            f'{settlement.lines_rejected} rejected'
+        ))
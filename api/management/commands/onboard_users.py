@@ -0,0 +1,85 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.utils.onboarding import (
+    ONBOARDING_COLUMNS, existing_emails, hash_passwords, init_hasher, onboard_chunk, parse_user, read_users,
+)
+from api.utils.settlements import chunked
+
+
+class Command(BaseCommand):
+
+    """Streams a user CSV into users and their default wallets, chunk by chunk."""
+
+    help = (
+        f'Create users from a CSV with the columns {", ".join(ONBOARDING_COLUMNS)}, each with a default wallet. '
+        'Passwords are hashed in a pool of worker processes while the previous chunk is written. '
+        'Users that already exist are skipped, so an interrupted run can be started again on the same file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='User CSV file')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Users created per database transaction')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Password hashing processes')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'{path} does not exist')
+
+        self.started = time.perf_counter()
+        self.created = 0
+        self.rejected = 0
+        workers = options['workers']
+        pending = None
+
+        with open(path, newline='', encoding='utf-8-sig') as f, \
+                ProcessPoolExecutor(max_workers=workers, initializer=init_hasher) as pool:
+            try:
+                for chunk in chunked(read_users(f), options['chunk_size']):
+                    users = []
+                    for line_number, row in chunk:
+                        try:
+                            users.append((line_number, *parse_user(row)))
+                        except (ValueError, AttributeError) as e:
+                            self.reject(line_number, str(e))
+
+                    # Don't spend hashing time on users created by an earlier run
+                    existing = existing_emails(user[1] for user in users)
+                    for user in users:
+                        if user[1] in existing:
+                            self.reject(user[0], f"user {user[1]} already exists")
+                    users = [user for user in users if user[1] not in existing]
+
+                    hashes = hash_passwords(pool, [user[-1] for user in users], workers)
+                    if pending is not None:
+                        self.create(*pending)
+                    pending = (users, hashes)
+            except ValueError as e:
+                raise CommandError(str(e))
+
+            if pending is not None:
+                self.create(*pending)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Onboarded {path.name}: {self.created} users created, {self.rejected} lines rejected'
+        ))
+
+    def create(self, users, hashes):
+        created, rejected = onboard_chunk([(*user[:-1], password) for user, password in zip(users, hashes)])
+        for line_number, reason in rejected:
+            self.reject(line_number, reason)
+
+        self.created += created
+        self.stdout.write(
+            f'{self.created} users created, {self.rejected} rejected '
+            f'({self.created / (time.perf_counter() - self.started):.0f} users/s)'
+        )
+
+    def reject(self, line_number, reason):
+        self.rejected += 1
+        self.stderr.write(f'line {line_number}: {reason}')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.activity_rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+
+    """Recomputes the monthly activity rollups from the ledger and older transactions, e.g. after a backfill."""
+
+    help = (
+        'Rebuild the monthly activity rollups. Run it while no money is being moved: '
+        'rollups are updated live by every deposit, withdrawal and transfer.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help='Only rebuild this user id (repeatable)')
+
+    def handle(self, *args, **options):
+        written, skipped = rebuild_rollups(options['users'])
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} activity rollups'))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f'{skipped} incoming transfers predate stored exchange rates and were left out'
+            ))
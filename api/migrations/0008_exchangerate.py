@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-17 22:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_transaction_user'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='transaction',
+            options={'ordering': ['-date']},
+        ),
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3)),
+                ('effective_date', models.DateField()),
+                ('mid', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('table', models.CharField(default='A', max_length=1)),
+                ('table_number', models.CharField(max_length=50)),
+            ],
+            options={
+                'ordering': ['-effective_date', 'currency'],
+                'indexes': [models.Index(fields=['currency', '-effective_date'], name='exchange_rate_currency_date'), models.Index(fields=['table', '-effective_date'], name='exchange_rate_table_date')],
+                'constraints': [models.UniqueConstraint(fields=('currency', 'effective_date', 'table'), name='unique_rate_per_currency_date')],
+            },
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='destination_rate',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='api.exchangerate'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='source_rate',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='api.exchangerate'),
+        ),
+    ]
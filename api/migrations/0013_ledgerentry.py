@@ -0,0 +1,61 @@
+# Generated by Django 5.1.4 on 2026-10-17 22:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def record_opening_balances(apps, schema_editor):
+    """
+    Start the ledger from the current balances: one credit entry per funded wallet,
+    so the latest entry of every wallet matches Wallet.balance from now on.
+    """
+    Wallet = apps.get_model('api', 'Wallet')
+    LedgerEntry = apps.get_model('api', 'LedgerEntry')
+    now = timezone.now()
+
+    wallets = Wallet.objects.exclude(balance=0).only('pk', 'wallet_address', 'currency', 'balance')
+    LedgerEntry.objects.bulk_create(
+        (
+            LedgerEntry(
+                direction='CREDIT',
+                account=wallet.wallet_address,
+                wallet=wallet,
+                currency=wallet.currency,
+                amount=wallet.balance,
+                balance=wallet.balance,
+                timestamp=now,
+            )
+            for wallet in wallets.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('direction', models.CharField(choices=[('DEBIT', 'DEBIT'), ('CREDIT', 'CREDIT')], max_length=6)),
+                ('account', models.CharField(max_length=255)),
+                ('currency', models.CharField(max_length=3)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('balance', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True)),
+                ('timestamp', models.DateTimeField()),
+                ('transaction', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='api.transaction')),
+                ('wallet', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='api.wallet')),
+            ],
+            options={
+                'ordering': ['-timestamp', '-id'],
+                'indexes': [models.Index(fields=['wallet', '-timestamp', '-id'], name='ledger_wallet_timestamp')],
+            },
+        ),
+        migrations.RunPython(record_opening_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-17 22:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_ledgerentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3)),
+                ('month', models.DateField()),
+                ('deposit_count', models.PositiveIntegerField(default=0)),
+                ('deposit_total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('withdrawal_count', models.PositiveIntegerField(default=0)),
+                ('withdrawal_total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('transfer_out_count', models.PositiveIntegerField(default=0)),
+                ('transfer_out_total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('transfer_in_count', models.PositiveIntegerField(default=0)),
+                ('transfer_in_total', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-month', 'currency'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'month', 'currency'), name='unique_rollup_per_user_month_currency')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.4 on 2026-10-17 23:05
+
+from django.db import migrations, transaction
+from django.db.models import Case, F, Max, OuterRef, Subquery, Value, When
+
+from api.utils.postgres import no_statement_timeout
+
+
+CHUNK_SIZE = 10000
+
+
+def backfill_transaction_wallets(apps, schema_editor):
+    """
+    Link existing transactions to the wallets their `source`/`destination` addresses
+    name, and copy the bank account of deposits and withdrawals.
+
+    Runs as one UPDATE per primary key range, each committed on its own, so large
+    tables are never locked as a whole. Each chunk sets the same values however often
+    it runs, so an interrupted migration can simply be run again.
+    """
+    Transaction = apps.get_model('api', 'Transaction')
+    Wallet = apps.get_model('api', 'Wallet')
+    alias = schema_editor.connection.alias
+
+    def wallet_named_by(field):
+        return Subquery(Wallet.objects.filter(wallet_address=OuterRef(field)).values('pk')[:1])
+
+    last_pk = Transaction.objects.using(alias).aggregate(last_pk=Max('pk'))['last_pk'] or 0
+    with no_statement_timeout(schema_editor):
+        for start in range(0, last_pk, CHUNK_SIZE):
+            with transaction.atomic(using=alias):
+                Transaction.objects.using(alias).filter(pk__gt=start, pk__lte=start + CHUNK_SIZE).update(
+                    # Deposits and withdrawals keep the bank account in `source` and the wallet address
+                    # in `destination`; a withdrawal's wallet is linked as its source, the debited side
+                    source_wallet=Case(
+                        When(transaction_type='TRANSFER', then=wallet_named_by('source')),
+                        When(transaction_type='WITHDRAWL', then=wallet_named_by('destination')),
+                        default=None,
+                    ),
+                    destination_wallet=Case(
+                        When(transaction_type='WITHDRAWL', then=None), default=wallet_named_by('destination'),
+                    ),
+                    bank_account=Case(When(transaction_type='TRANSFER', then=Value('')), default=F('source')),
+                )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('api', '0016_transaction_wallets'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_transaction_wallets, migrations.RunPython.noop),
+    ]
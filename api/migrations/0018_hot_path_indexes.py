@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-17 23:08
+
+from django.db import migrations, models
+
+from api.utils.postgres import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0017_backfill_transaction_wallets'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='ledgerentry',
+            index=models.Index(fields=['wallet', '-timestamp', '-id'], include=('balance',), name='ledger_wallet_balance'),
+        ),
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('source_wallet__isnull', False)), fields=['source_wallet', '-date', '-id'], name='transaction_source_wallet'),
+        ),
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('destination_wallet__isnull', False)), fields=['destination_wallet', '-date', '-id'], name='transaction_destination_wallet'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-17 23:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Dropped once the indexes of 0018 that replace them exist
+    dependencies = [
+        ('api', '0018_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ledgerentry',
+            name='ledger_wallet_timestamp',
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='destination_wallet',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transactions_as_destination', to='api.wallet'),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='source_wallet',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transactions_as_source', to='api.wallet'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-17 23:40
+
+from django.db import migrations, models
+
+from api.utils.postgres import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('api', '0019_drop_superseded_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'source'], name='transaction_user_source_like', opclasses=['int8_ops', 'varchar_pattern_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'destination'], name='transaction_user_dest_like', opclasses=['int8_ops', 'varchar_pattern_ops']),
+        ),
+        # Dropped once the indexes that replace them exist
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='transaction_user_source',
+        ),
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='transaction_user_destination',
+        ),
+    ]
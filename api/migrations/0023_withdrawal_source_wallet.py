@@ -0,0 +1,51 @@
+# Generated by Django 5.1.4 on 2026-10-17 23:52
+
+from django.db import migrations, transaction
+from django.db.models import F, Max
+
+from api.utils.postgres import no_statement_timeout
+
+
+CHUNK_SIZE = 10000
+
+
+def link_withdrawals_to_source(apps, schema_editor):
+    """
+    Move the wallet of existing withdrawals from `destination_wallet` to `source_wallet`,
+    the debited side. The `source`/`destination` addresses are left as they are.
+
+    Chunked by primary key like 0017; rows already moved are skipped, so an
+    interrupted migration can simply be run again.
+    """
+    move_withdrawal_wallets(apps, schema_editor, 'destination_wallet', 'source_wallet')
+
+
+def link_withdrawals_to_destination(apps, schema_editor):
+    move_withdrawal_wallets(apps, schema_editor, 'source_wallet', 'destination_wallet')
+
+
+def move_withdrawal_wallets(apps, schema_editor, from_field, to_field):
+    Transaction = apps.get_model('api', 'Transaction')
+    alias = schema_editor.connection.alias
+
+    last_pk = Transaction.objects.using(alias).aggregate(last_pk=Max('pk'))['last_pk'] or 0
+    with no_statement_timeout(schema_editor):
+        for start in range(0, last_pk, CHUNK_SIZE):
+            with transaction.atomic(using=alias):
+                Transaction.objects.using(alias).filter(
+                    pk__gt=start, pk__lte=start + CHUNK_SIZE, transaction_type='WITHDRAWL',
+                    **{f'{from_field}__isnull': False},
+                ).update(**{to_field: F(from_field), from_field: None})
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('api', '0022_idempotencykey_transaction'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_withdrawals_to_source, link_withdrawals_to_destination),
+    ]
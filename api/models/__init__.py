@@ -1,2 +1,7 @@
 from .user import User
-from .wallet import Wallet
\ No newline at end of file
+from .wallet import Wallet
+from .exchange_rate import ExchangeRate
+from .settlement_import import SettlementImport
+from .idempotency_key import IdempotencyKey
+from .ledger_entry import LedgerEntry
+from .activity_rollup import ActivityRollup
@@ -0,0 +1,100 @@
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class ActivityRollupManager(models.Manager):
+
+    """
+    Object Manager for ActivityRollup model.
+
+    Supports the following operations:
+
+        1. Adding the activity of newly written ledger entries
+        2. Adding precomputed totals, e.g. when rebuilding the rollups
+    """
+
+    # (transaction type, entry direction) -> rollup field prefix, for wallet entries
+    ACTIVITY = {
+        ('DEPOSIT', 'CREDIT'): 'deposit',
+        ('WITHDRAWL', 'DEBIT'): 'withdrawal',
+        ('TRANSFER', 'DEBIT'): 'transfer_out',
+        ('TRANSFER', 'CREDIT'): 'transfer_in',
+    }
+
+    @staticmethod
+    def month_of(moment):
+        return timezone.localtime(moment).date().replace(day=1)
+
+    def add_entries(self, entries):
+
+        """Adds the activity of LedgerEntry objects, which must have their transaction and wallet attached."""
+
+        totals = {}
+        for entry in entries:
+            if entry.wallet is None or entry.transaction is None:
+                continue
+
+            activity = self.ACTIVITY[entry.transaction.transaction_type, entry.direction]
+            key = (entry.wallet.user_id, entry.currency, self.month_of(entry.timestamp))
+            values = totals.setdefault(key, {})
+            values[f'{activity}_count'] = values.get(f'{activity}_count', 0) + 1
+            values[f'{activity}_total'] = values.get(f'{activity}_total', 0) + entry.amount
+
+        self.add(totals)
+
+    def add(self, totals):
+
+        """
+        Increments the rollups in ``totals``, {(user id, currency, month): {field: increment}}.
+
+        Rows are updated in key order with F() expressions, and created on first use.
+        """
+
+        for (user_id, currency, month), values in sorted(totals.items()):
+            rollup = self.filter(user_id=user_id, currency=currency, month=month)
+            increments = {field: F(field) + value for field, value in values.items()}
+
+            if rollup.update(**increments):
+                continue
+            try:
+                with transaction.atomic():
+                    self.create(user_id=user_id, currency=currency, month=month, **values)
+            except IntegrityError:
+                # Created concurrently for another wallet movement of the same month
+                rollup.update(**increments)
+
+
+class ActivityRollup(models.Model):
+
+    """
+    Activity rollup database model, the monthly totals of one user's wallet in one currency.
+
+    Kept up to date in the same database transaction as every balance change, so
+    dashboards read a handful of rows instead of aggregating the Transaction table.
+    Totals are in the wallet currency; ``transfer_in_total`` is the converted amount credited.
+    """
+
+    user = models.ForeignKey('api.User', on_delete=models.CASCADE)
+    currency = models.CharField(max_length=3)
+    month = models.DateField() # First day of the month
+    deposit_count = models.PositiveIntegerField(default=0)
+    deposit_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    withdrawal_count = models.PositiveIntegerField(default=0)
+    withdrawal_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    transfer_out_count = models.PositiveIntegerField(default=0)
+    transfer_out_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    transfer_in_count = models.PositiveIntegerField(default=0)
+    transfer_in_total = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    objects = ActivityRollupManager()
+
+    class Meta:
+        ordering = ['-month', 'currency']
+        constraints = [
+            # Also serves a user's stats, newest month first
+            models.UniqueConstraint(fields=['user', 'month', 'currency'], name='unique_rollup_per_user_month_currency'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} {self.currency} {self.month:%Y-%m}'
@@ -0,0 +1,85 @@
+from django.db import models
+
+
+class ExchangeRateManager(models.Manager):
+
+    """
+    Object Manager for ExchangeRate model.
+
+    Supports the following operations:
+
+        1. Loading the latest stored snapshot of a table
+        2. Storing a snapshot fetched from the NBP API
+
+    Methods prefixed with ``a`` are the async ORM variants used by async views.
+    """
+
+    def latest_effective_date(self, table='A'):
+        return (
+            self.filter(table=table)
+            .order_by('-effective_date')
+            .values_list('effective_date', flat=True)
+            .first()
+        )
+
+    def for_date(self, effective_date, table='A'):
+        return self.filter(table=table, effective_date=effective_date)
+
+    async def alatest_effective_date(self, table='A'):
+        return await (
+            self.filter(table=table)
+            .order_by('-effective_date')
+            .values_list('effective_date', flat=True)
+            .afirst()
+        )
+
+    def snapshot_rows(self, snapshot):
+        return [
+            self.model(
+                currency=currency,
+                effective_date=snapshot.effective_date,
+                mid=mid,
+                table=snapshot.table,
+                table_number=snapshot.number,
+            )
+            for currency, mid in snapshot.rates.items() if currency != 'PLN'
+        ]
+
+    def store_snapshot(self, snapshot):
+
+        """Persists every rate of a RateSnapshot, skipping rows that are already stored."""
+
+        self.bulk_create(self.snapshot_rows(snapshot), ignore_conflicts=True)
+
+        return self.for_date(snapshot.effective_date, snapshot.table)
+
+    async def astore_snapshot(self, snapshot):
+        await self.abulk_create(self.snapshot_rows(snapshot), ignore_conflicts=True)
+
+        return [record async for record in self.for_date(snapshot.effective_date, snapshot.table)]
+
+
+class ExchangeRate(models.Model):
+
+    """Exchange rate database model, one NBP mid rate (PLN per unit) per currency and date."""
+
+    currency = models.CharField(max_length=3)
+    effective_date = models.DateField()
+    mid = models.DecimalField(max_digits=18, decimal_places=8)
+    table = models.CharField(max_length=1, default='A') # NBP table the rate was published in
+    table_number = models.CharField(max_length=50) # NBP table number, e.g. 200/A/NBP/2026
+
+    objects = ExchangeRateManager()
+
+    class Meta:
+        ordering = ['-effective_date', 'currency']
+        indexes = [
+            models.Index(fields=['currency', '-effective_date'], name='exchange_rate_currency_date'),
+            models.Index(fields=['table', '-effective_date'], name='exchange_rate_table_date'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['currency', 'effective_date', 'table'], name='unique_rate_per_currency_date'),
+        ]
+
+    def __str__(self):
+        return f'{self.currency} {self.mid} ({self.effective_date})'
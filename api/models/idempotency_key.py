@@ -0,0 +1,33 @@
+from django.db import models
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class IdempotencyKey(models.Model):
+
+    """
+    Idempotency key database model, the first response to a money-moving request.
+
+    A row is claimed before the request is executed and completed with the response
+    afterwards, so a retry with the same key is answered from here instead of moving
+    money again. Rows without a status code are still being processed, or were
+    abandoned and can be taken over once IDEMPOTENCY_CLAIM_TIMEOUT has passed,
+    unless their request already moved money.
+    """
+
+    user = models.ForeignKey('api.User', on_delete=models.CASCADE)
+    key = models.CharField(max_length=255) # Value of the Idempotency-Key header
+    fingerprint = models.CharField(max_length=64) # SHA-256 of method, path and body, to reject reused keys
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=JSONEncoder) # Encoded like DRF renders it
+    # Set in the same database transaction as the balance change (the first Transaction of a
+    # batch), so a key whose request moved money is never run again, see idempotency.record_movement
+    transaction = models.ForeignKey('api.Transaction', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True) # Claim time; serves bulk expiry and stale claim takeover
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user'),
+        ]
+
+    def __str__(self):
+        return f'{self.key} ({self.status_code or "processing"})'
@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+from django.db import models
+
+
+class LedgerEntryManager(models.Manager):
+
+    """
+    Object Manager for LedgerEntry model.
+
+    Supports the following operations:
+
+        1. Recording the debit and credit entries of a movement
+        2. Balance of a wallet at a point in time
+        3. Statement of a wallet over a period
+
+    Both queries are a single range scan on the (wallet, timestamp, id) index.
+    """
+
+    def movement(self, transaction, debit, credit):
+
+        """
+        Entries of one movement; ``debit`` and ``credit`` are (account, wallet, currency, amount, balance)
+        tuples, with ``wallet`` and ``balance`` set to None for a bank account outside the app.
+        """
+
+        return [
+            self.model(
+                transaction=transaction,
+                direction=direction,
+                account=account,
+                wallet=wallet,
+                currency=currency,
+                amount=amount,
+                balance=balance,
+                timestamp=transaction.date,
+            )
+            for direction, (account, wallet, currency, amount, balance) in (
+                (LedgerEntry.DEBIT, debit), (LedgerEntry.CREDIT, credit),
+            )
+        ]
+
+    def balance_at(self, wallet, when):
+        balance = (
+            self.filter(wallet=wallet, timestamp__lte=when)
+            .order_by('-timestamp', '-id')
+            .values_list('balance', flat=True)
+            .first()
+        )
+        return Decimal(0) if balance is None else balance
+
+    def statement(self, wallet, start, end):
+        return self.filter(wallet=wallet, timestamp__gte=start, timestamp__lt=end).order_by('timestamp', 'id')
+
+
+class LedgerEntry(models.Model):
+
+    """
+    Ledger entry database model, one side of a money movement. Append-only.
+
+    Every Transaction has a debit and a credit entry, in the currency of the account
+    they touch: a transfer debits the source amount and credits the converted amount.
+    Wallet entries carry the wallet balance right after the entry, so the latest
+    entry before a point in time is the balance at that time.
+    """
+
+    DEBIT = 'DEBIT'
+    CREDIT = 'CREDIT'
+    DIRECTIONS = (
+        (DEBIT, 'DEBIT'),
+        (CREDIT, 'CREDIT'),
+    )
+
+    # Null for opening balances, recorded when the ledger was introduced. The links to the
+    # transaction and wallet are cleared when those are deleted, the entries are kept
+    transaction = models.ForeignKey('api.Transaction', on_delete=models.SET_NULL, null=True, blank=True, related_name='ledger_entries')
+    direction = models.CharField(max_length=6, choices=DIRECTIONS)
+    account = models.CharField(max_length=255) # Wallet address or bank account address
+    wallet = models.ForeignKey('api.Wallet', on_delete=models.SET_NULL, null=True, blank=True, related_name='ledger_entries') # Null for bank accounts; `account` keeps the address
+    currency = models.CharField(max_length=3)
+    amount = models.DecimalField(max_digits=15, decimal_places=2)
+    balance = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True) # Wallet balance after this entry
+    timestamp = models.DateTimeField()
+
+    objects = LedgerEntryManager()
+
+    class Meta:
+        ordering = ['-timestamp', '-id']
+        indexes = [
+            # Balance at a time and statements of a wallet. On PostgreSQL the balance is
+            # stored in the index too (INCLUDE), so balance_at is an index-only scan
+            models.Index(fields=['wallet', '-timestamp', '-id'], name='ledger_wallet_balance', include=['balance']),
+        ]
+
+    def __str__(self):
+        return f'{self.direction} {self.amount} {self.currency} {self.account}'
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class SettlementImport(models.Model):
+
+    """
+    Settlement import database model, the checkpoint of one bank settlement file.
+
+    Lines are applied in chunks, and ``lines_processed`` is advanced in the same
+    database transaction as each chunk, so an interrupted import resumes right
+    after the last committed chunk without applying any line twice.
+    """
+
+    checksum = models.CharField(max_length=64, unique=True) # SHA-256 of the file contents
+    filename = models.CharField(max_length=255)
+    lines_processed = models.PositiveIntegerField(default=0) # Data lines committed so far, rejected ones included
+    lines_rejected = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f'{self.filename} ({self.lines_processed} lines)'
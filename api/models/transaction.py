@@ -1,7 +1,5 @@
 from django.db import models
 
-from api.models.wallet import Wallet
-
 
 class Transaction(models.Model):
 
@@ -16,74 +14,103 @@ class Transaction(models.Model):
     user = models.ForeignKey('api.User', on_delete=models.CASCADE, default=0)
     source = models.CharField(max_length=100) # From which wallet or account is the money transferred from
     destination = models.CharField(max_length=100) # To which wallet is the money transferred to
+    # The wallets whose addresses are in `source` and `destination`, null for bank accounts and deleted wallets.
+    # Deposits and withdrawals both keep the wallet address in `destination` and the bank account in `source`,
+    # but link the debited wallet of a withdrawal as `source_wallet` and the credited wallet of a deposit as `destination_wallet`
+    # Indexed by the partial indexes in Meta instead of a plain index each
+    source_wallet = models.ForeignKey(
+        'api.Wallet', on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions_as_source',
+        db_index=False,
+    )
+    destination_wallet = models.ForeignKey(
+        'api.Wallet', on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions_as_destination',
+        db_index=False,
+    )
+    bank_account = models.CharField(max_length=100, blank=True) # Bank side of deposits and withdrawals
     transaction_type = models.CharField(max_length=50, choices=TRANSACTION_TYPES)
     amount = models.DecimalField(max_digits=15, decimal_places=2, default=0.0)
     date = models.DateTimeField(auto_now_add=True)
+    # Rates applied to a transfer, kept for audits. Null for the PLN side and for deposits/withdrawals
+    source_rate = models.ForeignKey('api.ExchangeRate', on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    destination_rate = models.ForeignKey('api.ExchangeRate', on_delete=models.PROTECT, null=True, blank=True, related_name='+')
 
     
     class Meta:
         ordering = ['-date']
+        indexes = [
+            # Serves a user's history newest first and keyset pagination on (date, id)
+            models.Index(fields=['user', '-date', '-id'], name='transaction_user_date_id'),
+            models.Index(fields=['user', 'transaction_type', '-date', '-id'], name='transaction_user_type_date'),
+            # Exact and prefix lookups on either side of a transaction. The operator classes
+            # let PostgreSQL use them for LIKE 'prefix%' under any collation; other databases ignore them
+            models.Index(
+                fields=['user', 'source'], name='transaction_user_source_like',
+                opclasses=['int8_ops', 'varchar_pattern_ops'],
+            ),
+            models.Index(
+                fields=['user', 'destination'], name='transaction_user_dest_like',
+                opclasses=['int8_ops', 'varchar_pattern_ops'],
+            ),
+            # A wallet's history newest first (the currency filter) and SET_NULL on wallet deletion.
+            # Partial: deposits have no source wallet, withdrawals no destination wallet
+            models.Index(
+                fields=['source_wallet', '-date', '-id'], name='transaction_source_wallet',
+                condition=models.Q(source_wallet__isnull=False),
+            ),
+            models.Index(
+                fields=['destination_wallet', '-date', '-id'], name='transaction_destination_wallet',
+                condition=models.Q(destination_wallet__isnull=False),
+            ),
+        ]
 
 
     @property
     def source_wallet_details(self):
+        return self.wallet_details()
 
-        if self.transaction_type == 'TRANSFER':
 
-            from_wallet = Wallet.objects.get(wallet_address=self.source)
-            to_wallet = Wallet.objects.get(wallet_address=self.destination)
+    def wallet_details(self):
 
+        """
+        Details of the user and wallets involved in the transaction.
+
+        Select the related ``user``, ``source_wallet`` and ``destination_wallet`` to
+        serialize a list of transactions without querying the wallets of each one.
+        Wallets deleted since are reported as None.
+        """
+
+        def describe(wallet):
+            if wallet is None:
+                return None
             return {
-                'user': {
-                    'first_name': self.user.first_name,
-                    'last_name': self.user.last_name,
-                    'email': self.user.email
-                },
-                'transferred_from_wallet': {
-                    'wallet_address': from_wallet.wallet_address,
-                    'balance': from_wallet.balance,
-                    'currency': from_wallet.currency,
-                },
-                'transferred_to_wallet': {
-                    'wallet_address': to_wallet.wallet_address,
-                    'balance': to_wallet.balance,
-                    'currency': to_wallet.currency
-                }
+                'wallet_address': wallet.wallet_address,
+                'balance': wallet.balance,
+                'currency': wallet.currency,
             }
-        
-        elif self.transaction_type == "DEPOSIT":
-            
-            wallet = Wallet.objects.get(wallet_address=self.destination)
 
+        user = {
+            'first_name': self.user.first_name,
+            'last_name': self.user.last_name,
+            'email': self.user.email,
+        }
+
+        if self.transaction_type == 'TRANSFER':
             return {
-                'user': {
-                    'first_name': self.user.first_name,
-                    'last_name': self.user.last_name,
-                    'email': self.user.email,
-                },
-                'transferred_from_bank_address': self.source,
-                'transferred_to_wallet': {
-                    'wallet_address': wallet.wallet_address,
-                    'balance': wallet.balance,
-                    'currency': wallet.currency
-                }
+                'user': user,
+                'transferred_from_wallet': describe(self.source_wallet),
+                'transferred_to_wallet': describe(self.destination_wallet),
             }
-        
-        else:
 
-            wallet = Wallet.objects.get(wallet_address=self.destination)
+        elif self.transaction_type == "DEPOSIT":
+            return {
+                'user': user,
+                'transferred_from_bank_address': self.bank_account,
+                'transferred_to_wallet': describe(self.destination_wallet),
+            }
 
+        else:
             return {
-                'user': {
-                    'first_name': self.user.first_name,
-                    'last_name': self.user.last_name,
-                    'email': self.user.email,
-                },
-                'transferred_from_wallet': {
-                    'wallet_address': wallet.wallet_address,
-                    'balance': wallet.balance,
-                    'currency': wallet.currency
-                },
-                'transferred_to_bank_address': self.source
+                'user': user,
+                'transferred_from_wallet': describe(self.source_wallet),
+                'transferred_to_bank_address': self.bank_account,
             }
-    
\ No newline at end of file
@@ -5,6 +5,8 @@ import uuid
 class Wallet(models.Model):
     """Wallet Database model."""
 
+    DEFAULT_CURRENCY = 'PLN'  # Every new user gets a wallet in it
+
     CURRENCIES = (
         ('THB', 'Thai Baht'),
         ('USD', 'US Dollar'),
@@ -62,6 +64,8 @@ class Wallet(models.Model):
     balance = models.DecimalField(max_digits=15, decimal_places=2, default=0.0)
     currency = models.CharField(max_length=100, choices=CURRENCIES)
     wallet_address = models.CharField(max_length=40, unique=True, editable=False)
+    # Bumped by every change of the row, balance changes included; the ETag of the wallet
+    version = models.PositiveBigIntegerField(default=0, editable=False)
 
     @property
     def user_details(self):
@@ -77,8 +81,16 @@ class Wallet(models.Model):
             models.UniqueConstraint(fields=['user', 'currency'], name='unique_wallet_per_currency')
         ]
 
+    @staticmethod
+    def generate_address(user_id):
+        # Generate a more unique wallet address
+        return f"{str(uuid.uuid4())[:18]}{user_id}"
+
     def save(self, *args, **kwargs):
         if not self.wallet_address:
-            # Generate a more unique wallet address
-            self.wallet_address = f"{str(uuid.uuid4())[:18]}{self.user.id}"
+            self.wallet_address = self.generate_address(self.user.id)
+        if not self._state.adding:
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
         super().save(*args, **kwargs)
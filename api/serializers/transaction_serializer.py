@@ -1,13 +1,70 @@
 from rest_framework import serializers
 
+from api.models.activity_rollup import ActivityRollup
 from api.models.transaction import Transaction
+from api.models.wallet import Wallet
 
 
 class TransactionSerializer(serializers.ModelSerializer):
 
-    """Transaction model serializer."""
+    """
+    Transaction model serializer.
+
+    Select the related user and wallets (see Transaction.wallet_details) when
+    serializing many transactions, so wallet details don't cost queries per row.
+    """
+
+    source_wallet_details = serializers.SerializerMethodField()
     
     class Meta:
         model = Transaction 
         fields = ('user', 'source', 'destination', 'transaction_type', 'amount', 'date', 'source_wallet_details',)
         read_only_fields = ('date',)
+
+    def get_source_wallet_details(self, obj):
+        return obj.wallet_details()
+
+
+class TransactionFilterSerializer(serializers.Serializer):
+
+    """Validates the query parameters used to filter a user's transactions."""
+
+    date_from = serializers.DateField(required=False, help_text='Include transactions made on or after this day')
+    date_to = serializers.DateField(required=False, help_text='Include transactions made on or before this day')
+    transaction_type = serializers.ChoiceField(choices=Transaction.TRANSACTION_TYPES, required=False)
+    currency = serializers.ChoiceField(choices=Wallet.CURRENCIES, required=False)
+    counterparty = serializers.CharField(
+        max_length=100, required=False, help_text='Bank account or wallet address, or a prefix of one'
+    )
+
+    def validate(self, attrs):
+        if attrs.get('date_from') and attrs.get('date_to') and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError("date_from must not be after date_to.")
+        return attrs
+
+
+class ActivityStatsFilterSerializer(serializers.Serializer):
+
+    """Validates the query parameters of the monthly activity stats."""
+
+    date_from = serializers.DateField(required=False, help_text='Include the month of this day and later months')
+    date_to = serializers.DateField(required=False, help_text='Include the month of this day and earlier months')
+    currency = serializers.ChoiceField(choices=Wallet.CURRENCIES, required=False)
+
+    def validate(self, attrs):
+        if attrs.get('date_from') and attrs.get('date_to') and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError("date_from must not be after date_to.")
+        return attrs
+
+
+class ActivityRollupSerializer(serializers.ModelSerializer):
+
+    """Activity rollup model serializer, one month of activity in one currency."""
+
+    class Meta:
+        model = ActivityRollup
+        fields = (
+            'month', 'currency',
+            'deposit_count', 'deposit_total', 'withdrawal_count', 'withdrawal_total',
+            'transfer_out_count', 'transfer_out_total', 'transfer_in_count', 'transfer_in_total',
+        )
@@ -1,5 +1,9 @@
+from decimal import Decimal
+
 from rest_framework import serializers
+from api.models.ledger_entry import LedgerEntry
 from api.models.wallet import Wallet
+from api.utils.wallet_repository import WalletRepository
 
 
 class WalletSerializer(serializers.ModelSerializer):
@@ -23,7 +27,7 @@ class WalletDepositWithdrawSerializer(serializers.Serializer):
     amount = serializers.DecimalField(
         max_digits=15, 
         decimal_places=2, 
-        min_value=0.01, 
+        min_value=Decimal('0.01'), 
         required=True
     )
 
@@ -37,18 +41,18 @@ class WalletTransferSerializer(serializers.Serializer):
     amount = serializers.DecimalField(
         max_digits=15,
         decimal_places=2,
-        min_value=0.01,
+        min_value=Decimal('0.01'),
         required=True
     )
 
     def __init__(self, *args, **kwargs):
         """
         Dynamically set choices for source_currency and destination_currency
-        based on the user's wallets.
+        based on the user's wallets, from the request's WalletRepository.
         """
-        user = kwargs['context']['request'].user
+        request = kwargs['context']['request']
         super().__init__(*args, **kwargs)
-        user_wallets = Wallet.objects.filter(user=user).values_list('currency', flat=True)
+        user_wallets = WalletRepository.for_request(request).currencies()
         wallet_choices = [(currency, currency) for currency in user_wallets]
         self.fields['source_currency'].choices = wallet_choices
         self.fields['destination_currency'].choices = wallet_choices
@@ -61,4 +65,82 @@ class WalletTransferSerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 "Source and destination currencies must be different."
             )
-        return data
\ No newline at end of file
+        return data
+
+class WalletTransferLegSerializer(serializers.Serializer):
+    """
+    Serializer for one transfer of a batch. Ownership of the wallets is checked
+    by WalletBatchTransferSerializer, against the request's WalletRepository.
+    """
+    source_currency = serializers.ChoiceField(choices=Wallet.CURRENCIES, required=True)
+    destination_currency = serializers.ChoiceField(choices=Wallet.CURRENCIES, required=True)
+    amount = serializers.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        min_value=Decimal('0.01'),
+        required=True
+    )
+
+    def validate(self, data):
+        if data['source_currency'] == data['destination_currency']:
+            raise serializers.ValidationError(
+                "Source and destination currencies must be different."
+            )
+        return data
+
+
+class WalletBatchTransferSerializer(serializers.Serializer):
+    """
+    Serializer for a batch of transfers between the user's wallets.
+    """
+    transfers = WalletTransferLegSerializer(many=True, allow_empty=False, max_length=100)
+
+    def validate_transfers(self, transfers):
+        currencies = set(WalletRepository.for_request(self.context['request']).currencies())
+
+        errors = []
+        for transfer in transfers:
+            missing = {transfer['source_currency'], transfer['destination_currency']} - currencies
+            errors.append(
+                {"non_field_errors": [f"No wallet for currency: {', '.join(sorted(missing))}."]} if missing else {}
+            )
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return transfers
+
+
+class WalletValuationSerializer(serializers.Serializer):
+    """
+    Serializer for the query parameters of the wallet valuation endpoint.
+    """
+    currency = serializers.ChoiceField(choices=Wallet.CURRENCIES, default='PLN')
+
+
+class WalletBalanceAtSerializer(serializers.Serializer):
+    """
+    Serializer for the query parameters of the balance-at-time endpoint.
+    """
+    at = serializers.DateTimeField(required=True, help_text='Point in time to get the balance at')
+
+
+class WalletStatementSerializer(serializers.Serializer):
+    """
+    Serializer for the query parameters of the wallet statement endpoint.
+    """
+    date_from = serializers.DateField(required=True, help_text='First day of the statement')
+    date_to = serializers.DateField(required=True, help_text='Last day of the statement')
+
+    def validate(self, attrs):
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError("date_from must not be after date_to.")
+        return attrs
+
+
+class LedgerEntrySerializer(serializers.ModelSerializer):
+
+    """Ledger entry model serializer, as listed in a wallet statement."""
+
+    class Meta:
+        model = LedgerEntry
+        fields = ('timestamp', 'direction', 'amount', 'balance', 'transaction')
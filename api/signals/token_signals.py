@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from api.authentication.token_authentication import cache, invalidate_user_tokens, token_cache_key
+from api.models.user import User
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_tokens(sender, instance, created, **kwargs):
+    # Password changes, deactivation and profile updates all go through User.save()
+    if not created:
+        invalidate_user_tokens(instance)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    # Logout, and users being deleted (their tokens are deleted with them)
+    cache.delete(token_cache_key(instance.key))
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.models.user import User
+from api.utils.user_list_cache import invalidate_user_list
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user_list(sender, instance, **kwargs):
+    invalidate_user_list()
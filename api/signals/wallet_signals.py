@@ -8,4 +8,4 @@ from api.models.user import User  # Adjust this import based on your project str
 def create_wallet_for_user(sender, instance, created, **kwargs):
     if created:
         # Create a Wallet with default currency 'PLN'
-        Wallet.objects.create(user=instance, balance=0.0, currency='PLN')
+        Wallet.objects.create(user=instance, balance=0.0, currency=Wallet.DEFAULT_CURRENCY)
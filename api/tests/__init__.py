@@ -0,0 +1,6 @@
+# Per-process caches for the tests, so they neither see nor touch the shared
+# and throttle caches of a development server on the same host
+LOCAL_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': alias}
+    for alias in ('default', 'shared', 'throttle')
+}
@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from api.models.user import User
+from api.models.wallet import Wallet
+from api.tests import LOCAL_CACHES
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class AsyncWalletViewErrorTests(TestCase):
+
+    """Request errors of the async wallet views get the status codes the sync views give."""
+
+    def setUp(self):
+        user = User.objects.create_user('Async', 'User', 'async@example.com', 'password')
+        self.headers = {'Authorization': f'Token {Token.objects.create(user=user).key}'}
+
+    async def test_malformed_json_is_a_bad_request(self):
+        response = await self.async_client.put(
+            '/api/wallets/async/PLN/deposit/', '{"amount": ', content_type='application/json', headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('JSON parse error', response.json()['detail'])
+
+    async def test_unsupported_media_type(self):
+        response = await self.async_client.put(
+            '/api/wallets/async/PLN/deposit/', 'amount=10', content_type='text/plain', headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, 415)
+        self.assertIn('text/plain', response.json()['detail'])
+
+    async def test_invalid_amount_is_a_bad_request(self):
+        response = await self.async_client.put(
+            '/api/wallets/async/PLN/deposit/', {'amount': '-1', 'bank_account_address': 'PL00'},
+            content_type='application/json', headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('amount', response.json())
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class AsyncIdempotencyTests(TestCase):
+
+    """The async views honour Idempotency-Key like the sync ones."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('Async', 'User', 'async@example.com', 'password')
+        self.token = Token.objects.create(user=self.user).key
+
+    def deposit(self, amount='10.00'):
+        return self.async_client.put(
+            '/api/wallets/async/PLN/deposit/', {'bank_account_address': 'PL00', 'amount': amount},
+            content_type='application/json',
+            headers={'Authorization': f'Token {self.token}', 'Idempotency-Key': 'async-deposit-1'},
+        )
+
+    async def test_retry_replays_the_first_response(self):
+        first = await self.deposit()
+        retry = await self.deposit()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual((await Wallet.objects.aget(user=self.user)).balance, Decimal('10.00'))
+
+    async def test_key_reused_for_another_request_is_rejected(self):
+        await self.deposit()
+
+        self.assertEqual((await self.deposit(amount='20.00')).status_code, 422)
@@ -0,0 +1,142 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from api.models.ledger_entry import LedgerEntry
+from api.models.transaction import Transaction
+from api.models.user import User
+from api.models.wallet import Wallet
+from api.tests import LOCAL_CACHES
+from api.utils import balances
+from api.utils.rate_provider import RateSnapshot
+
+
+class BalanceServiceTests(TestCase):
+
+    """Balance changes of api.utils.balances and the rows recorded with them."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('Balance', 'User', 'balance@example.com', 'password')
+        self.pln = Wallet.objects.get(user=self.user)
+        self.pln.balance = Decimal('100.00')
+        self.pln.save()
+        self.eur = Wallet.objects.create(
+            user=self.user, currency='EUR', balance=Decimal('10.00'), wallet_address='EUR-balance-user',
+        )
+        self.snapshot = RateSnapshot('A', '001/A/NBP/2026', date(2026, 1, 2), {'EUR': Decimal('4.25')})
+
+    def assertBalances(self, pln, eur):
+        self.assertEqual(Wallet.objects.get(pk=self.pln.pk).balance, Decimal(pln))
+        self.assertEqual(Wallet.objects.get(pk=self.eur.pk).balance, Decimal(eur))
+
+    def test_wallets_are_locked_in_primary_key_order(self):
+        with CaptureQueriesContext(connection) as queries:
+            locked = balances.lock_wallets(self.eur, self.pln, self.eur)
+
+        self.assertEqual(list(locked), sorted([self.pln.pk, self.eur.pk]))
+        self.assertEqual(len(queries), 1)
+        self.assertIn('ORDER BY "api_wallet"."id" ASC', queries[0]['sql'])
+
+    def test_deposit_and_withdraw(self):
+        wallet = balances.deposit(self.user, self.pln, 'PL00', Decimal('25.50'))
+        self.assertEqual(wallet.balance, Decimal('125.50'))
+
+        wallet = balances.withdraw(self.user, self.pln, 'PL00', Decimal('125.50'))
+        self.assertEqual(wallet.balance, Decimal('0.00'))
+
+        self.assertBalances('0.00', '10.00')
+        self.assertEqual(Wallet.objects.get(pk=self.pln.pk).version, self.pln.version + 2)
+        self.assertEqual(LedgerEntry.objects.filter(wallet=self.pln).count(), 2)
+        # The credited wallet of a deposit is its destination, the debited wallet of a withdrawal its source
+        self.assertEqual(
+            list(Transaction.objects.order_by('pk').values_list('transaction_type', 'source_wallet', 'destination_wallet')),
+            [('DEPOSIT', None, self.pln.pk), ('WITHDRAWL', self.pln.pk, None)],
+        )
+
+    def test_overdraft_is_refused(self):
+        with self.assertRaises(balances.InsufficientFunds):
+            balances.withdraw(self.user, self.pln, 'PL00', Decimal('100.01'))
+
+        self.assertBalances('100.00', '10.00')
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_transfer_credits_the_converted_amount_in_cents(self):
+        source, destination = balances.transfer(
+            self.user, self.pln, self.eur, Decimal('10.00'), Decimal('10.00') / Decimal('4.25'), self.snapshot,
+        )
+
+        self.assertEqual((source.balance, destination.balance), (Decimal('90.00'), Decimal('12.35')))
+        self.assertBalances('90.00', '12.35')
+        entries = LedgerEntry.objects.filter(transaction__source_wallet=self.pln).order_by('direction')
+        self.assertEqual(
+            [(entry.direction, entry.amount, entry.balance) for entry in entries],
+            [(LedgerEntry.CREDIT, Decimal('2.35'), Decimal('12.35')), (LedgerEntry.DEBIT, Decimal('10.00'), Decimal('90.00'))],
+        )
+
+    def test_failed_transfer_changes_neither_wallet(self):
+        with self.assertRaises(balances.InsufficientFunds):
+            balances.transfer(self.user, self.eur, self.pln, Decimal('10.01'), Decimal('42.54'), self.snapshot)
+
+        self.assertBalances('100.00', '10.00')
+
+    def test_batch_legs_spend_what_earlier_legs_credited(self):
+        results = balances.batch_transfer(self.user, [
+            {'source_wallet': self.eur, 'destination_wallet': self.pln, 'amount': Decimal('10.00'), 'converted_amount': Decimal('42.50')},
+            {'source_wallet': self.pln, 'destination_wallet': self.eur, 'amount': Decimal('142.50'), 'converted_amount': Decimal('33.53')},
+        ], self.snapshot)
+
+        self.assertEqual(results, [(Decimal('0.00'), Decimal('142.50')), (Decimal('0.00'), Decimal('33.53'))])
+        self.assertBalances('0.00', '33.53')
+        self.assertEqual(Transaction.objects.count(), 2)
+
+    def test_failed_batch_leg_applies_nothing(self):
+        with self.assertRaises(balances.InsufficientFunds) as failure:
+            balances.batch_transfer(self.user, [
+                {'source_wallet': self.pln, 'destination_wallet': self.eur, 'amount': Decimal('50.00'), 'converted_amount': Decimal('11.76')},
+                {'source_wallet': self.pln, 'destination_wallet': self.eur, 'amount': Decimal('50.01'), 'converted_amount': Decimal('11.77')},
+            ], self.snapshot)
+
+        self.assertEqual(failure.exception.leg, 1)
+        self.assertBalances('100.00', '10.00')
+        self.assertFalse(Transaction.objects.exists())
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class TransferResponseTests(TestCase):
+
+    """Transfer responses report the amount actually credited, in cents."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('Transfer', 'User', 'transfer@example.com', 'password')
+        Wallet.objects.filter(user=self.user).update(balance=Decimal('100.00'))
+        Wallet.objects.create(user=self.user, currency='EUR', balance=Decimal('10.00'), wallet_address='EUR-transfer-user')
+        self.snapshot = RateSnapshot('A', '001/A/NBP/2026', date(2026, 1, 2), {'EUR': Decimal('4.25')})
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {Token.objects.create(user=self.user).key}'
+        patcher = mock.patch('api.views.wallet_views.get_rate_snapshot', return_value=self.snapshot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_transfer(self):
+        response = self.client.post(
+            '/api/wallets/transfer/', {'source_currency': 'PLN', 'destination_currency': 'EUR', 'amount': '10.00'},
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['destination_amount'], '2.35')
+        self.assertEqual(response.json()['destination_balance'], '12.35')
+
+    def test_batch_transfer(self):
+        response = self.client.post(
+            '/api/wallets/transfer/batch/',
+            {'transfers': [{'source_currency': 'PLN', 'destination_currency': 'EUR', 'amount': '10.00'}]},
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['transfers'][0]['destination_amount'], '2.35')
@@ -0,0 +1,137 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from api.models.idempotency_key import IdempotencyKey
+from api.models.transaction import Transaction
+from api.models.user import User
+from api.models.wallet import Wallet
+from api.tests import LOCAL_CACHES
+from api.utils import idempotency
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class IdempotentDepositTests(TestCase):
+
+    """Deposits sent with an Idempotency-Key move money once, however often they are retried."""
+
+    url = '/api/wallets/PLN/deposit/'
+
+    def setUp(self):
+        self.user = User.objects.create_user('Idempotent', 'User', 'idempotent@example.com', 'password')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {Token.objects.create(user=self.user).key}'
+
+    def deposit(self, amount='10.00', key='deposit-1'):
+        headers = {'Idempotency-Key': key} if key else {}
+        return self.client.put(
+            self.url, {'bank_account_address': 'PL00', 'amount': amount},
+            content_type='application/json', headers=headers,
+        )
+
+    def balance(self):
+        return Wallet.objects.get(user=self.user).balance
+
+    def test_retry_replays_the_first_response(self):
+        first = self.deposit()
+        retry = self.deposit()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertNotIn('Idempotent-Replayed', first)
+        self.assertEqual(self.balance(), Decimal('10.00'))
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 1)
+
+    def test_replay_runs_no_wallet_queries(self):
+        self.deposit()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.deposit()
+
+        # Only the claim and the stored key, never the wallets
+        tables = ' '.join(query['sql'] for query in queries)
+        self.assertIn('api_idempotencykey', tables)
+        self.assertNotIn('api_wallet', tables)
+        self.assertNotIn('api_transaction', tables)
+
+    def test_key_reused_for_another_request_is_rejected(self):
+        self.deposit()
+        response = self.deposit(amount='20.00')
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.balance(), Decimal('10.00'))
+
+    def test_failed_request_releases_its_key(self):
+        self.assertEqual(self.deposit(amount='-1').status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        self.assertEqual(self.deposit(amount='-1').status_code, 400)
+
+    def test_requests_without_a_key_run_every_time(self):
+        self.deposit(key=None)
+        self.deposit(key=None)
+
+        self.assertEqual(self.balance(), Decimal('20.00'))
+
+    def abandon_claim(self, age):
+        # What a worker killed between claiming the key and completing it leaves behind
+        request = RequestFactory().put(
+            self.url, {'bank_account_address': 'PL00', 'amount': '10.00'}, content_type='application/json',
+        )
+        record = IdempotencyKey.objects.create(
+            user=self.user, key='deposit-1', fingerprint=idempotency.request_fingerprint(request),
+        )
+        IdempotencyKey.objects.filter(pk=record.pk).update(created_at=timezone.now() - age)
+
+    @override_settings(IDEMPOTENCY_CLAIM_TIMEOUT=60)
+    def test_running_request_is_a_conflict(self):
+        self.abandon_claim(timedelta(seconds=30))
+
+        self.assertEqual(self.deposit().status_code, 409)
+        self.assertEqual(self.balance(), Decimal('0.00'))
+
+    @override_settings(IDEMPOTENCY_CLAIM_TIMEOUT=60)
+    def test_abandoned_claim_is_taken_over(self):
+        self.abandon_claim(timedelta(seconds=90))
+
+        response = self.deposit()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(self.balance(), Decimal('10.00'))
+        self.assertEqual(self.deposit()['Idempotent-Replayed'], 'true')
+
+    def test_key_is_linked_to_its_transaction(self):
+        self.deposit()
+
+        record = IdempotencyKey.objects.get(user=self.user)
+        self.assertEqual(record.transaction, Transaction.objects.get(user=self.user))
+
+    @override_settings(IDEMPOTENCY_CLAIM_TIMEOUT=0)
+    def test_request_that_moved_money_is_never_run_again(self):
+        # The worker dies after the deposit committed, before its response is stored
+        with mock.patch('api.utils.idempotency.complete', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.deposit()
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(seconds=1))
+
+        response = self.deposit()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('was applied', response.json()['detail'])
+        self.assertEqual(self.balance(), Decimal('10.00'))
+
+    def test_request_failing_after_moving_money_keeps_its_key(self):
+        with mock.patch('api.views.wallet_views.Response', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.deposit()
+
+        self.assertEqual(self.deposit().status_code, 409)
+        self.assertEqual(self.balance(), Decimal('10.00'))
@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from api.models.ledger_entry import LedgerEntry
+from api.models.transaction import Transaction
+from api.models.user import User
+from api.models.wallet import Wallet
+from api.tests import LOCAL_CACHES
+from api.utils import balances
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class LedgerHistoryTests(TestCase):
+
+    """The ledger is append-only: deleting a wallet keeps the entries of its history."""
+
+    def test_deleting_a_wallet_keeps_its_entries(self):
+        user = User.objects.create_user('Ledger', 'User', 'ledger@example.com', 'password')
+        wallet = Wallet.objects.create(user=user, currency='EUR', wallet_address='EUR-ledger-user')
+        balances.deposit(user, wallet, 'DE89', Decimal('5.00'))
+        balances.withdraw(user, wallet, 'DE89', Decimal('5.00'))
+
+        response = self.client.delete(
+            '/api/wallets/EUR/', headers={'Authorization': f'Token {Token.objects.create(user=user).key}'}
+        )
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(Transaction.objects.filter(user=user).count(), 2)
+        entries = LedgerEntry.objects.filter(account='EUR-ledger-user')
+        self.assertEqual([(entry.wallet_id, entry.amount) for entry in entries], [(None, Decimal('5.00'))] * 2)
+        self.assertEqual(LedgerEntry.objects.count(), 4)
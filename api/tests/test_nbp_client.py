@@ -0,0 +1,73 @@
+import asyncio
+
+import requests
+from django.test import SimpleTestCase
+
+from api.utils.fake_nbp_server import FakeNBPServer
+from api.utils.nbp_client import AsyncNBPClient, CircuitBreaker, CircuitOpenError, NBPClient
+
+
+class NBPClientCircuitBreakerTests(SimpleTestCase):
+
+    """The circuit breaker of the NBP clients, against the bundled FakeNBPServer."""
+
+    def setUp(self):
+        self.server = FakeNBPServer().start()
+        self.addCleanup(self.server.stop)
+        self.client = NBPClient(
+            base_url=self.server.url, connect_timeout=1, read_timeout=1, max_retries=0, retry_backoff=0,
+            pool_size=2, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0),
+        )
+
+    def open_circuit(self):
+        self.server.failure_rate = 1
+        with self.assertRaises(requests.HTTPError):
+            self.client.get_json('exchangerates/tables/a/')
+        self.server.failure_rate = 0
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
+
+    def test_success_closes_the_circuit(self):
+        self.open_circuit()
+
+        table = self.client.get_json('exchangerates/tables/a/')
+
+        self.assertEqual(table[0]['table'], 'A')
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_open_circuit_fails_fast(self):
+        self.client.breaker.reset_timeout = 60
+        self.open_circuit()
+        requests_made = self.server.request_count
+
+        with self.assertRaises(CircuitOpenError):
+            self.client.get_json('exchangerates/tables/a/')
+        self.assertEqual(self.server.request_count, requests_made)
+
+    def test_unexpected_error_in_trial_call_reopens_the_circuit(self):
+        self.open_circuit()
+        self.server.truncate_rate = 1
+
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            self.client.get_json('exchangerates/tables/a/')
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
+
+        # Not stuck half-open: the next trial call goes through and closes it
+        self.server.truncate_rate = 0
+        self.client.get_json('exchangerates/tables/a/')
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_cancelled_async_trial_call_reopens_the_circuit(self):
+        self.open_circuit()
+        async_client = AsyncNBPClient(self.client)
+        self.server.latency = 0.5
+
+        async def cancelled_call():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(async_client.get_json('exchangerates/tables/a/'), timeout=0.05)
+
+        asyncio.run(cancelled_call())
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
+
+        self.server.latency = 0
+        asyncio.run(async_client.get_json('exchangerates/tables/a/'))
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.CLOSED)
@@ -0,0 +1,57 @@
+import shutil
+import tempfile
+import time
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api.tests import LOCAL_CACHES
+from api.utils.file_cache import FileBasedCache
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class LoginThrottleTests(TestCase):
+
+    """Login attempts are limited per client address."""
+
+    url = '/api/users/login/'
+
+    def login(self, **headers):
+        return self.client.post(self.url, {'email': 'nobody@example.com', 'password': 'wrong'}, headers=headers)
+
+    def test_forwarded_for_header_does_not_switch_buckets(self):
+        for _ in range(10):
+            self.assertEqual(self.login().status_code, 400)
+        self.assertEqual(self.login().status_code, 429)
+
+        for i in range(5):
+            response = self.login(**{'X-Forwarded-For': f'203.0.113.{i}'})
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response)
+
+
+class FileBasedCacheCullTests(SimpleTestCase):
+
+    """Culling the file-based cache drops expired entries before live ones."""
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.cache = FileBasedCache(location, {'OPTIONS': {'MAX_ENTRIES': 3}})
+        self.cache.cull_interval = 0
+
+    def test_expired_entries_are_culled_first(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, key, timeout=0.01)
+        time.sleep(0.02)
+
+        for key in ('d', 'e', 'f'):
+            self.cache.set(key, key)
+
+        self.assertEqual(self.cache.get_many(['d', 'e', 'f']), {'d': 'd', 'e': 'e', 'f': 'f'})
+        self.assertEqual(len(self.cache._list_cache_files()), 3)
+
+    def test_live_entries_are_culled_beyond_max_entries(self):
+        for key in 'abcdefgh':
+            self.cache.set(key, key)
+
+        self.assertLess(len(self.cache._list_cache_files()), 8)
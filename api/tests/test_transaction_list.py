@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from api.models.user import User
+from api.models.wallet import Wallet
+from api.tests import LOCAL_CACHES
+from api.utils import balances
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class TransactionListQueryTests(TestCase):
+
+    """GET /api/transactions/ runs the same number of queries whatever the page size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('List', 'User', 'list@example.com', 'password')
+        cls.token = Token.objects.create(user=cls.user)
+        wallet = Wallet.objects.get(user=cls.user)
+        for i in range(60):
+            balances.deposit(cls.user, wallet, 'PL00', Decimal('1.00'))
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {self.token.key}'
+
+    def get_page(self, page_size, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get('/api/transactions/', {'page_size': page_size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), page_size)
+        return response
+
+    def test_queries_dont_grow_with_page_size(self):
+        # Token and user, then the page with its user and wallets joined
+        self.get_page(5, queries=2)
+        self.get_page(50, queries=1)  # The token is cached now
+
+    def test_next_page(self):
+        self.get_page(5, queries=2)
+        next_link = self.get_page(50, queries=1).json()['next']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(next_link)
+        self.assertEqual(len(response.json()['results']), 10)
+
+    def test_counterparty_prefix(self):
+        balances.deposit(self.user, Wallet.objects.get(user=self.user), 'DE89', Decimal('1.00'))
+
+        response = self.client.get('/api/transactions/', {'counterparty': 'DE', 'page_size': 5})
+
+        self.assertEqual([row['source'] for row in response.json()['results']], ['DE89'])
+
+    def test_withdrawal_is_listed_from_its_wallet(self):
+        wallet = Wallet.objects.get(user=self.user)
+        balances.withdraw(self.user, wallet, 'DE89', Decimal('1.00'))
+
+        response = self.client.get('/api/transactions/', {'currency': wallet.currency, 'transaction_type': 'WITHDRAWL'})
+        [row] = response.json()['results']
+        self.assertEqual(row['source_wallet_details']['transferred_from_wallet']['wallet_address'], wallet.wallet_address)
+        self.assertEqual(row['source_wallet_details']['transferred_to_bank_address'], 'DE89')
+
+        response = self.client.get('/api/transactions/export/ndjson/', {'transaction_type': 'WITHDRAWL'})
+        [line] = b''.join(response.streaming_content).decode().splitlines()
+        self.assertIn(f'"destination_currency": "{wallet.currency}"', line)
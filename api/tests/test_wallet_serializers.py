@@ -0,0 +1,20 @@
+from django.test import SimpleTestCase
+
+from api.serializers.wallet_serializer import WalletDepositWithdrawSerializer, WalletTransferLegSerializer
+
+
+class MinimumAmountTests(SimpleTestCase):
+
+    """Amounts down to one cent are accepted."""
+
+    def test_transfer_leg_of_one_cent(self):
+        leg = {'source_currency': 'PLN', 'destination_currency': 'EUR'}
+
+        self.assertTrue(WalletTransferLegSerializer(data={**leg, 'amount': '0.01'}).is_valid())
+        self.assertFalse(WalletTransferLegSerializer(data={**leg, 'amount': '0.00'}).is_valid())
+
+    def test_deposit_of_one_cent(self):
+        data = {'bank_account_address': 'PL00'}
+
+        self.assertTrue(WalletDepositWithdrawSerializer(data={**data, 'amount': '0.01'}).is_valid())
+        self.assertFalse(WalletDepositWithdrawSerializer(data={**data, 'amount': '0.00'}).is_valid())
@@ -0,0 +1,80 @@
+import math
+import time
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucketThrottle(BaseThrottle):
+
+    """
+    Token bucket throttle, configured per view with ``throttle_scope``.
+
+    The rate of a scope comes from ``DEFAULT_THROTTLE_RATES`` in the DRF format,
+    e.g. '30/min': a bucket holds up to 30 tokens and refills 30 per minute, so a
+    client may burst 30 requests and is then held to the average rate. There is one
+    bucket per scope and user, or per IP for anonymous requests.
+
+    Buckets live in the 'throttle' cache, shared by the workers. DRF checks throttles
+    before the handler runs, so a throttled request gets a 429 with Retry-After
+    without any database or NBP work. Concurrent requests of one client may race on
+    its bucket, which can let a request or two more through; that is fine for this use.
+    """
+
+    cache_alias = 'throttle'
+    scope_attr = 'throttle_scope'
+    timer = time.time
+    durations = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def allow_request(self, request, view):
+        scope = getattr(view, self.scope_attr, None)
+        if not scope:
+            return True
+
+        capacity, refill_rate = self.parse_rate(self.get_rate(scope))
+        key = self.get_cache_key(request, scope)
+        cache = caches[self.cache_alias]
+        now = self.timer()
+
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+
+        if tokens < 1:
+            # Nothing to store: the bucket keeps refilling from `updated`
+            self.wait_seconds = (1 - tokens) / refill_rate
+            return False
+
+        # Expire once the bucket would be full again, which is the same as no entry
+        cache.set(key, (tokens - 1, now), timeout=math.ceil((capacity - tokens + 1) / refill_rate))
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+    def get_rate(self, scope):
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[scope]
+        except KeyError:
+            raise ImproperlyConfigured(f"No default throttle rate set for '{scope}' scope")
+
+    def parse_rate(self, rate):
+        """
+        Return the (capacity, tokens per second) of a '<requests>/<period>' rate.
+        """
+        num, period = rate.split('/')
+        capacity = int(num)
+        return capacity, capacity / self.durations[period[0]]
+
+    def get_cache_key(self, request, scope):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            ident = f'user-{user.pk}'
+        else:
+            ident = f'ip-{self.get_ident(request)}'
+        return f'throttle:{scope}:{ident}'
@@ -0,0 +1,6 @@
+from django.urls import path
+from api.views.rate_views import RateMatrixView
+
+urlpatterns = [
+    path('', RateMatrixView.as_view(), name='rate-matrix'),
+]
@@ -1,6 +1,8 @@
 from django.urls import path
-from api.views.transaction_views import TransactionListView
+from api.views.transaction_views import TransactionListView, TransactionExportView, TransactionStatsView
 
 urlpatterns = [
     path('', TransactionListView.as_view(), name='transaction-list'),
+    path('stats/', TransactionStatsView.as_view(), name='transaction-stats'),
+    path('export/<str:export_format>/', TransactionExportView.as_view(), name='transaction-export'),
 ]
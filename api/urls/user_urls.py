@@ -10,6 +10,7 @@ urlpatterns = [
     path('', user_views.AllUsers.as_view(), name='all-users'),
     path('create/', user_views.UserAPIView.as_view(), name='create-user'),
     path('login/', user_views.AuthTokenAPIView.as_view(), name='user-token'),
+    path('logout/', user_views.LogoutAPIView.as_view(), name='user-logout'),
     path('verify_token/', user_views.VerifyToken.as_view(), name='token-verification'),
     path('<str:email>/', user_views.RetrieveUserAPIView.as_view(), name='user'),
     path('<str:email>/update/', user_views.UpdateUserAPIView.as_view(), name='update-user'),
@@ -1,10 +1,22 @@
 from django.urls import path
-from api.views.wallet_views import WalletListView, WalletDetailView, WalletDepositView, WalletWithdrawView, WalletTransferView
+from api.views.wallet_views import (
+    WalletListView, WalletDetailView, WalletDepositView, WalletWithdrawView, WalletTransferView,
+    WalletBatchTransferView, WalletValuationView, WalletBalanceAtView, WalletStatementView,
+)
+from api.views.async_wallet_views import AsyncWalletDepositView, AsyncWalletWithdrawView, AsyncWalletTransferView
 
 urlpatterns = [
     path('', WalletListView.as_view(), name='wallet-list-create'),
     path('transfer/', WalletTransferView.as_view(), name='wallet-transfer'),
+    path('transfer/batch/', WalletBatchTransferView.as_view(), name='wallet-transfer-batch'),
+    path('valuation/', WalletValuationView.as_view(), name='wallet-valuation'),
+    # Async variants, served without blocking a worker when running under ASGI (core/asgi.py)
+    path('async/transfer/', AsyncWalletTransferView.as_view(), name='wallet-transfer-async'),
+    path('async/<str:currency>/deposit/', AsyncWalletDepositView.as_view(), name='wallet-deposit-async'),
+    path('async/<str:currency>/withdraw/', AsyncWalletWithdrawView.as_view(), name='wallet-withdraw-async'),
     path('<str:currency>/', WalletDetailView.as_view(), name='wallet-detail'),
     path('<str:currency>/deposit/', WalletDepositView.as_view(), name='wallet-deposit'),  # Wallet deposit endpoint
     path('<str:currency>/withdraw/', WalletWithdrawView.as_view(), name='wallet-withdraw'),
+    path('<str:currency>/balance/', WalletBalanceAtView.as_view(), name='wallet-balance-at'),
+    path('<str:currency>/statement/', WalletStatementView.as_view(), name='wallet-statement'),
 ]
@@ -0,0 +1,130 @@
+# activity_rollups.py
+
+from django.db import transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+
+from api.models.activity_rollup import ActivityRollup
+from api.models.ledger_entry import LedgerEntry
+from api.models.transaction import Transaction
+from api.utils.balances import CENT
+
+
+def add_total(totals, key, activity, count, total):
+    values = totals.setdefault(key, {})
+    values[f'{activity}_count'] = values.get(f'{activity}_count', 0) + count
+    values[f'{activity}_total'] = values.get(f'{activity}_total', 0) + total
+
+
+def ledger_totals(totals, user_ids=None):
+    """
+    Add the activity recorded in the ledger, aggregated by the database.
+    """
+    entries = LedgerEntry.objects.filter(wallet__isnull=False, transaction__isnull=False)
+    if user_ids is not None:
+        entries = entries.filter(wallet__user_id__in=user_ids)
+
+    rows = (
+        entries.annotate(month=TruncMonth('timestamp', output_field=DateField()))
+        .values('wallet__user_id', 'currency', 'month', 'transaction__transaction_type', 'direction')
+        .annotate(count=Count('id'), total=Sum('amount'))
+        .order_by()
+    )
+    for row in rows.iterator():
+        activity = ActivityRollup.objects.ACTIVITY[row['transaction__transaction_type'], row['direction']]
+        add_total(totals, (row['wallet__user_id'], row['currency'], row['month']), activity, row['count'], row['total'])
+
+
+def converted_amount(item, source_wallet, destination_wallet):
+    """
+    Amount credited by a transfer recorded before the ledger, from the rates it stored.
+    Returns None if the transfer predates stored rates.
+    """
+    def mid(wallet, record):
+        if record is not None:
+            return record.mid
+        return 1 if wallet.currency == 'PLN' else None
+
+    source_mid = mid(source_wallet, item.source_rate)
+    destination_mid = mid(destination_wallet, item.destination_rate)
+    if source_mid is None or destination_mid is None:
+        return None
+    return (item.amount * source_mid / destination_mid).quantize(CENT)
+
+
+def legacy_totals(totals, user_ids=None, chunk_size=2000):
+    """
+    Add the activity of transactions written before the ledger existed.
+    Returns the number of incoming transfers left out because their credited amount is unknown.
+    """
+    transactions = (
+        Transaction.objects.filter(ledger_entries__isnull=True)
+        .select_related('source_wallet', 'destination_wallet', 'source_rate', 'destination_rate')
+        .order_by('pk')
+    )
+    if user_ids is not None:
+        transactions = transactions.filter(user_id__in=user_ids)
+
+    skipped = 0
+    chunk = []
+    for item in transactions.iterator(chunk_size=chunk_size):
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            skipped += legacy_chunk_totals(totals, chunk)
+            chunk = []
+    return skipped + legacy_chunk_totals(totals, chunk)
+
+
+def legacy_chunk_totals(totals, chunk):
+    month_of = ActivityRollup.objects.month_of
+    skipped = 0
+
+    for item in chunk:
+        source_wallet = item.source_wallet
+        destination_wallet = item.destination_wallet
+        month = month_of(item.date)
+
+        if item.transaction_type == 'DEPOSIT':
+            if destination_wallet is not None:
+                add_total(totals, (destination_wallet.user_id, destination_wallet.currency, month), 'deposit', 1, item.amount)
+            continue
+        if item.transaction_type == 'WITHDRAWL':
+            if source_wallet is not None:
+                add_total(totals, (source_wallet.user_id, source_wallet.currency, month), 'withdrawal', 1, item.amount)
+            continue
+
+        if source_wallet is not None:
+            add_total(totals, (source_wallet.user_id, source_wallet.currency, month), 'transfer_out', 1, item.amount)
+        if destination_wallet is not None:
+            credited = None if source_wallet is None else converted_amount(item, source_wallet, destination_wallet)
+            if credited is None:
+                skipped += 1
+            else:
+                add_total(totals, (destination_wallet.user_id, destination_wallet.currency, month), 'transfer_in', 1, credited)
+
+    return skipped
+
+
+@transaction.atomic
+def rebuild_rollups(user_ids=None):
+    """
+    Recompute the activity rollups of `user_ids` (everyone by default) from the ledger,
+    plus the transactions that predate it. Returns (rollups written, transfers skipped).
+    """
+    rollups = ActivityRollup.objects.all()
+    if user_ids is not None:
+        rollups = rollups.filter(user_id__in=user_ids)
+    rollups.delete()
+
+    totals = {}
+    ledger_totals(totals, user_ids)
+    skipped = legacy_totals(totals, user_ids)
+
+    ActivityRollup.objects.bulk_create(
+        (
+            ActivityRollup(user_id=user_id, currency=currency, month=month, **values)
+            for (user_id, currency, month), values in totals.items()
+        ),
+        batch_size=2000,
+    )
+    return len(totals), skipped
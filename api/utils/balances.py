@@ -0,0 +1,233 @@
+# balances.py
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+
+from api.models.activity_rollup import ActivityRollup
+from api.models.ledger_entry import LedgerEntry
+from api.models.transaction import Transaction
+from api.models.wallet import Wallet
+from api.utils import idempotency
+
+
+CENT = Decimal('0.01')
+
+
+class InsufficientFunds(Exception):
+    """Raised when a wallet doesn't hold enough funds for a debit."""
+
+    def __init__(self, currency, leg=None):
+        super().__init__(currency)
+        self.currency = currency
+        self.leg = leg  # Index of the failing transfer in a batch
+
+
+def credited_amount(converted_amount):
+    """Return the amount a transfer credits for ``converted_amount``, rounded to cents."""
+
+    return converted_amount.quantize(CENT)
+
+
+def lock_wallets(*wallets):
+    """
+    Lock the wallet rows for the rest of the current transaction.
+
+    Rows are always locked in primary key order, so two transfers between the same
+    pair of wallets in opposite directions queue up instead of deadlocking.
+    Returns the locked wallets keyed by primary key.
+    """
+    pks = sorted({wallet.pk for wallet in wallets})
+    return {wallet.pk: wallet for wallet in Wallet.objects.select_for_update().filter(pk__in=pks).order_by('pk')}
+
+
+def debit(wallet, amount):
+    # Checked and applied in the same statement, so a concurrent debit can't overdraw the wallet
+    if not Wallet.objects.filter(pk=wallet.pk, balance__gte=amount).update(
+        balance=F('balance') - amount, version=F('version') + 1
+    ):
+        raise InsufficientFunds(wallet.currency)
+
+
+def credit(wallet, amount):
+    Wallet.objects.filter(pk=wallet.pk).update(balance=F('balance') + amount, version=F('version') + 1)
+
+
+def record_entries(entries):
+    """
+    Append ledger entries and add them to the monthly activity rollups, in the
+    caller's database transaction.
+    """
+    ActivityRollup.objects.add_entries(LedgerEntry.objects.bulk_create(entries))
+
+
+def refresh_balances(*wallets):
+    balances = dict(Wallet.objects.filter(pk__in=[wallet.pk for wallet in wallets]).values_list('pk', 'balance'))
+    for wallet in wallets:
+        wallet.balance = balances[wallet.pk]
+
+
+@transaction.atomic
+def deposit(user, wallet, bank_account_address, amount):
+    """
+    Credit the wallet and record the deposit.
+    Returns the wallet with its new balance.
+    """
+    lock_wallets(wallet)
+    credit(wallet, amount)
+
+    record = Transaction.objects.create(
+        user=user,
+        source=bank_account_address,
+        destination=wallet.wallet_address,
+        destination_wallet=wallet,
+        bank_account=bank_account_address,
+        transaction_type="DEPOSIT",
+        amount=amount,
+    )
+    idempotency.record_movement(record)
+
+    refresh_balances(wallet)
+    record_entries(LedgerEntry.objects.movement(
+        record,
+        debit=(bank_account_address, None, wallet.currency, amount, None),
+        credit=(wallet.wallet_address, wallet, wallet.currency, amount, wallet.balance),
+    ))
+    return wallet
+
+
+@transaction.atomic
+def withdraw(user, wallet, bank_account_address, amount):
+    """
+    Debit the wallet and record the withdrawal.
+    Returns the wallet with its new balance, raises InsufficientFunds if the balance is too low.
+    """
+    lock_wallets(wallet)
+    debit(wallet, amount)
+
+    record = Transaction.objects.create(
+        user=user,
+        source=bank_account_address,
+        destination=wallet.wallet_address,
+        source_wallet=wallet,
+        bank_account=bank_account_address,
+        transaction_type="WITHDRAWL",
+        amount=amount,
+    )
+    idempotency.record_movement(record)
+
+    refresh_balances(wallet)
+    record_entries(LedgerEntry.objects.movement(
+        record,
+        debit=(wallet.wallet_address, wallet, wallet.currency, amount, wallet.balance),
+        credit=(bank_account_address, None, wallet.currency, amount, None),
+    ))
+    return wallet
+
+
+@transaction.atomic
+def transfer(user, source_wallet, destination_wallet, amount, converted_amount, snapshot):
+    """
+    Move funds between two wallets and record the transfer.
+    - `amount` is debited in the source currency, `converted_amount` is credited
+      in the destination currency, rounded to cents.
+    - `snapshot` is the RateSnapshot the conversion was priced from.
+    Returns both wallets with their new balances, raises InsufficientFunds if the
+    source balance is too low. Either both balances change or neither does.
+    """
+    credited = credited_amount(converted_amount)
+
+    lock_wallets(source_wallet, destination_wallet)
+    debit(source_wallet, amount)
+    credit(destination_wallet, credited)
+
+    record = Transaction.objects.create(
+        user=user,
+        source=source_wallet.wallet_address,
+        destination=destination_wallet.wallet_address,
+        source_wallet=source_wallet,
+        destination_wallet=destination_wallet,
+        transaction_type="TRANSFER",
+        amount=amount,
+        source_rate=snapshot.record(source_wallet.currency),
+        destination_rate=snapshot.record(destination_wallet.currency),
+    )
+    idempotency.record_movement(record)
+
+    refresh_balances(source_wallet, destination_wallet)
+    record_entries(LedgerEntry.objects.movement(
+        record,
+        debit=(source_wallet.wallet_address, source_wallet, source_wallet.currency, amount, source_wallet.balance),
+        credit=(
+            destination_wallet.wallet_address, destination_wallet, destination_wallet.currency,
+            credited, destination_wallet.balance,
+        ),
+    ))
+    return source_wallet, destination_wallet
+
+
+@transaction.atomic
+def batch_transfer(user, legs, snapshot):
+    """
+    Apply a list of transfers as one unit, all priced from the same rate snapshot.
+    - `legs` are dicts with `source_wallet`, `destination_wallet`, `amount` and
+      `converted_amount`, applied in order, so a leg can spend what an earlier
+      leg credited.
+    - Every involved wallet is locked once, balances are worked out in memory and
+      written back with a single bulk update, followed by one bulk insert of the
+      Transaction rows and one of their ledger entries.
+    Returns the (source, destination) balances after each leg, raises InsufficientFunds
+    for the first leg that would overdraw its source wallet; nothing is applied then.
+    """
+    wallets = lock_wallets(*(wallet for leg in legs for wallet in (leg['source_wallet'], leg['destination_wallet'])))
+
+    results = []
+    for index, leg in enumerate(legs):
+        source_wallet = wallets[leg['source_wallet'].pk]
+        destination_wallet = wallets[leg['destination_wallet'].pk]
+
+        if source_wallet.balance < leg['amount']:
+            raise InsufficientFunds(source_wallet.currency, leg=index)
+
+        source_wallet.balance -= leg['amount']
+        destination_wallet.balance += credited_amount(leg['converted_amount'])
+        results.append((source_wallet.balance, destination_wallet.balance))
+
+    for wallet in wallets.values():
+        wallet.version += 1
+    Wallet.objects.bulk_update(wallets.values(), ['balance', 'version'])
+
+    records = Transaction.objects.bulk_create(
+        Transaction(
+            user=user,
+            source=leg['source_wallet'].wallet_address,
+            destination=leg['destination_wallet'].wallet_address,
+            source_wallet=leg['source_wallet'],
+            destination_wallet=leg['destination_wallet'],
+            transaction_type="TRANSFER",
+            amount=leg['amount'],
+            source_rate=snapshot.record(leg['source_wallet'].currency),
+            destination_rate=snapshot.record(leg['destination_wallet'].currency),
+        )
+        for leg in legs
+    )
+    idempotency.record_movement(records[0])
+
+    record_entries(
+        entry
+        for record, leg, (source_balance, destination_balance) in zip(records, legs, results)
+        for entry in LedgerEntry.objects.movement(
+            record,
+            debit=(
+                record.source, leg['source_wallet'], leg['source_wallet'].currency,
+                leg['amount'], source_balance,
+            ),
+            credit=(
+                record.destination, leg['destination_wallet'], leg['destination_wallet'].currency,
+                credited_amount(leg['converted_amount']), destination_balance,
+            ),
+        )
+    )
+
+    return results
@@ -0,0 +1,35 @@
+# conditional.py
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+def version_etag(*parts):
+    """Strong ETag of a resource identified by ``parts``, e.g. primary keys and version counters."""
+
+    return '"%s"' % hashlib.sha256(':'.join(map(str, parts)).encode()).hexdigest()[:32]
+
+
+def conditional_response(request, etag, render, last_modified=None):
+    """
+    Answer a GET with its validators, calling ``render()`` for the body only when needed.
+
+    Returns a 304 Not Modified when If-None-Match (or, without it, If-Modified-Since)
+    matches, so an unchanged resource is never serialized. Responses are private and
+    always revalidated, since they depend on the authenticated user.
+    """
+
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = render()
+
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Authorization',))
+    return response
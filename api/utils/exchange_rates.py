@@ -0,0 +1,104 @@
+# exchange_rates.py
+
+import time
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from api.models.exchange_rate import ExchangeRate
+from api.utils.rate_cache import RateCache, last_publication_date
+from api.utils.rate_provider import NBPRateProvider, RateSnapshot
+
+
+rate_cache = RateCache(
+    ttl=settings.EXCHANGE_RATE_CACHE_TTL,
+    stale_ttl=settings.EXCHANGE_RATE_CACHE_STALE_TTL,
+    publication_time=settings.NBP_PUBLICATION_TIME,
+    background_cleanup=connections.close_all,
+)
+
+rate_provider = NBPRateProvider()
+
+
+def load_rate_snapshot():
+    """
+    Load the current snapshot from the ExchangeRate table.
+
+    The NBP API is only called when the newest stored table is older than the
+    latest expected publication; the fetched table is stored before it is used,
+    so transfers can reference the exact rows they were priced from.
+    """
+
+    table = rate_provider.table
+    effective_date = ExchangeRate.objects.latest_effective_date(table)
+    expected_date = last_publication_date(time.time(), settings.NBP_PUBLICATION_TIME)
+
+    if effective_date is None or effective_date < expected_date:
+        records = ExchangeRate.objects.store_snapshot(rate_provider.fetch_snapshot())
+    else:
+        records = ExchangeRate.objects.for_date(effective_date, table)
+
+    return RateSnapshot.from_records(records)
+
+
+async def aload_rate_snapshot():
+    """Async variant of load_rate_snapshot using the async ORM and the non-blocking NBP client."""
+
+    table = rate_provider.table
+    effective_date = await ExchangeRate.objects.alatest_effective_date(table)
+    expected_date = last_publication_date(time.time(), settings.NBP_PUBLICATION_TIME)
+
+    if effective_date is None or effective_date < expected_date:
+        records = await ExchangeRate.objects.astore_snapshot(await rate_provider.afetch_snapshot())
+    else:
+        records = [record async for record in ExchangeRate.objects.for_date(effective_date, table)]
+
+    return RateSnapshot.from_records(records)
+
+
+def last_known_snapshot():
+    """Return the most recent snapshot held in memory or stored locally, or None."""
+
+    snapshot = rate_cache.peek(rate_provider.table)
+    if snapshot is not None:
+        return snapshot
+
+    effective_date = ExchangeRate.objects.latest_effective_date(rate_provider.table)
+    if effective_date is None:
+        return None
+
+    return RateSnapshot.from_records(ExchangeRate.objects.for_date(effective_date, rate_provider.table))
+
+
+def get_rate_snapshot():
+    """
+    Return the current table A snapshot, served from the rate cache.
+
+    The whole table is cached under a single key, so at most one database
+    read (and one NBP request) per publication prices every currency pair.
+    While the NBP API is failing (or its circuit is open) the last known
+    snapshot is returned instead; it is not cached, so the next request
+    tries again as soon as the circuit breaker allows it.
+    """
+
+    try:
+        return rate_cache.get(rate_provider.table, load_rate_snapshot)
+    except requests.RequestException:
+        snapshot = last_known_snapshot()
+        if snapshot is None:
+            raise
+        return snapshot
+
+
+async def aget_rate_snapshot():
+    """Async variant of get_rate_snapshot for async views."""
+
+    try:
+        return await rate_cache.aget(rate_provider.table, aload_rate_snapshot)
+    except requests.RequestException:
+        snapshot = await sync_to_async(last_known_snapshot)()
+        if snapshot is None:
+            raise
+        return snapshot
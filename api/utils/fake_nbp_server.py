@@ -0,0 +1,139 @@
+# fake_nbp_server.py
+
+import json
+import random
+import re
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# A representative table A, PLN per unit of currency
+DEFAULT_RATES = {
+    'THB': 0.1118, 'USD': 3.6512, 'AUD': 2.3937, 'HKD': 0.4695, 'CAD': 2.6122,
+    'NZD': 2.1018, 'SGD': 2.8264, 'EUR': 4.2511, 'HUF': 0.010986, 'CHF': 4.5817,
+    'GBP': 4.8934, 'UAH': 0.0878, 'JPY': 0.024181, 'CZK': 0.1752, 'DKK': 0.5693,
+    'ISK': 0.029887, 'NOK': 0.3627, 'SEK': 0.3870, 'RON': 0.8357, 'BGN': 2.1736,
+    'TRY': 0.0874, 'ILS': 1.1034, 'CLP': 0.003797, 'PHP': 0.0628, 'MXN': 0.1980,
+    'ZAR': 0.2104, 'BRL': 0.6710, 'MYR': 0.8661, 'IDR': 0.00022, 'INR': 0.0413,
+    'KRW': 0.002570, 'CNY': 0.5125, 'XDR': 4.9830,
+}
+
+
+class FakeNBPServer:
+
+    """
+    Local stand-in for the NBP exchange rate API.
+
+    Serves ``/api/exchangerates/tables/a/`` and ``/api/exchangerates/rates/a/{code}/``
+    from ``rates``. Every request is delayed by ``latency`` seconds (plus up to
+    ``jitter`` more) and fails with a 503 with probability ``failure_rate``, or
+    with a body cut short (the connection closes early) with probability ``truncate_rate``.
+    The settings can be changed while the server runs.
+
+    Usage:
+
+        with FakeNBPServer(latency=0.2, failure_rate=0.1) as server:
+            client = NBPClient(base_url=server.url, ...)
+    """
+
+    def __init__(
+        self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, failure_rate=0.0, truncate_rate=0.0, rates=None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.truncate_rate = truncate_rate
+        self.rates = dict(rates or DEFAULT_RATES)
+        self.request_count = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/api'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def table_document(self):
+        effective_date = date.today()
+        return [{
+            'table': 'A',
+            'no': f'{effective_date.timetuple().tm_yday:03d}/A/NBP/{effective_date.year}',
+            'effectiveDate': effective_date.isoformat(),
+            'rates': [{'currency': code, 'code': code, 'mid': mid} for code, mid in self.rates.items()],
+        }]
+
+    def rate_document(self, code):
+        table = self.table_document()[0]
+        return {
+            'table': 'A',
+            'currency': code,
+            'code': code,
+            'rates': [{'no': table['no'], 'effectiveDate': table['effectiveDate'], 'mid': self.rates[code]}],
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                server.request_count += 1
+                time.sleep(server.latency + random.uniform(0, server.jitter))
+
+                if random.random() < server.failure_rate:
+                    return self._send(503, {'error': 'Injected failure'})
+
+                if random.random() < server.truncate_rate:
+                    return self._send(200, server.table_document(), truncate=True)
+
+                path = self.path.split('?')[0].rstrip('/')
+
+                if path == '/api/exchangerates/tables/a':
+                    return self._send(200, server.table_document())
+
+                match = re.fullmatch(r'/api/exchangerates/rates/a/(\w{3})', path)
+                if match and match.group(1).upper() in server.rates:
+                    return self._send(200, server.rate_document(match.group(1).upper()))
+
+                self._send(404, {'error': 'Not Found'})
+
+            def _send(self, status, body, truncate=False):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                if truncate:
+                    payload = payload[:len(payload) // 2]
+                    self.close_connection = True
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting, e.g. on a read timeout
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
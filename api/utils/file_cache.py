@@ -0,0 +1,47 @@
+# file_cache.py
+
+import time
+
+from django.core.cache.backends import filebased
+
+
+class FileBasedCache(filebased.FileBasedCache):
+
+    """
+    FileBasedCache for entries written on every request, like throttle buckets.
+
+    - Django's scans the whole cache directory on every write to count the entries.
+      Here a process scans it at most once every ``cull_interval`` seconds, so the
+      cache may run a little over MAX_ENTRIES in between.
+    - Django's culls a random third of the entries once MAX_ENTRIES is reached,
+      expired or not, and only deletes an expired entry when it is read. Buckets of
+      clients that went quiet are never read again, so they pile up until a cull,
+      which then also resets live buckets to full. Here expired entries are dropped
+      first, and live ones are only culled when they alone reach MAX_ENTRIES.
+    """
+
+    cull_interval = 5
+    next_cull = {}  # Cache directory -> monotonic time of the next scan, per process
+
+    def _cull(self):
+        now = time.monotonic()
+        if now < self.next_cull.get(self._dir, 0):
+            return
+        self.next_cull[self._dir] = now + self.cull_interval
+
+        filelist = self._list_cache_files()
+        if len(filelist) < self._max_entries:
+            return
+
+        live = sum(not self._expired(fname) for fname in filelist)
+        if live >= self._max_entries:
+            super()._cull()
+
+    def _expired(self, fname):
+        """Return whether the entry in ``fname`` is gone, deleting it if it's expired."""
+
+        try:
+            with open(fname, 'rb') as f:
+                return self._is_expired(f)
+        except FileNotFoundError:
+            return True
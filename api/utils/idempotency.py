@@ -0,0 +1,241 @@
+# idempotency.py
+
+import functools
+import hashlib
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.models.idempotency_key import IdempotencyKey
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+# Claimed key of the request running in the current context, see record_movement()
+current_claim = ContextVar('idempotency_claim', default=None)
+
+
+class IdempotencyError(Exception):
+    """Raised when a request can't be executed or replayed under its Idempotency-Key."""
+
+    def __init__(self, detail, status_code):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def request_key(request):
+    key = request.headers.get(IDEMPOTENCY_HEADER, '').strip()
+    if len(key) > IdempotencyKey._meta.get_field('key').max_length:
+        raise IdempotencyError(f"{IDEMPOTENCY_HEADER} is too long.", status.HTTP_400_BAD_REQUEST)
+    return key
+
+
+def request_fingerprint(request):
+    """
+    Hash of what the request asks for, so a key reused for another request is rejected.
+    Reads the raw body, which Django keeps for the parsers that run afterwards.
+    """
+    digest = hashlib.sha256()
+    for part in (request.method, request.path):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def claim(user, key, fingerprint):
+    """
+    Claim `key` for a new request, or return the completed record of an earlier one.
+    Returns (record, created); raises IdempotencyError if the key belongs to another
+    request or the earlier request hasn't finished yet. An unfinished claim older than
+    IDEMPOTENCY_CLAIM_TIMEOUT that hasn't moved money is taken over, see take_over().
+    """
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, fingerprint=fingerprint), True
+    except IntegrityError:
+        record = IdempotencyKey.objects.get(user=user, key=key)
+
+    if record.fingerprint != fingerprint:
+        raise IdempotencyError(
+            f"This {IDEMPOTENCY_HEADER} was already used for a different request.",
+            status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    if record.status_code is None:
+        if record.transaction_id is not None:
+            raise IdempotencyError(
+                f"The request with this {IDEMPOTENCY_HEADER} was applied, but its response wasn't stored.",
+                status.HTTP_409_CONFLICT
+            )
+        if take_over(record):
+            return record, True
+        raise IdempotencyError(
+            f"A request with this {IDEMPOTENCY_HEADER} is still being processed.",
+            status.HTTP_409_CONFLICT
+        )
+    return record, False
+
+
+def take_over(record):
+    """
+    Claim an unfinished key again once its claim is older than IDEMPOTENCY_CLAIM_TIMEOUT
+    seconds, e.g. after the worker running its request was killed before completing or
+    releasing it. Keys whose request moved money are never taken over, see
+    record_movement(). The claim time is reset in a single conditional update, so only
+    one retry wins. Returns whether the key was taken over.
+    """
+    now = timezone.now()
+    stale = IdempotencyKey.objects.filter(
+        pk=record.pk,
+        status_code__isnull=True,
+        transaction__isnull=True,
+        created_at__lt=now - timedelta(seconds=settings.IDEMPOTENCY_CLAIM_TIMEOUT),
+    )
+    if not stale.update(created_at=now):
+        return False
+    record.created_at = now
+    return True
+
+
+def record_movement(movement):
+    """
+    Link the claimed key of the running request, if any, to ``movement``, the Transaction
+    that moved its money. Called by api.utils.balances in the same database transaction as the
+    balance change, so once the money has moved the key can't run its request again,
+    even if the response is never stored.
+    """
+    record = current_claim.get()
+    if record is None or record.transaction_id is not None:
+        return
+    IdempotencyKey.objects.filter(pk=record.pk).update(transaction=movement)
+    record.transaction = movement
+
+
+def complete(record, status_code, data):
+    """
+    Store the response of a claimed request. Only successful responses are stored:
+    failed requests don't move money, so their key is released and can be retried.
+    """
+    if not status.is_success(status_code):
+        release(record)
+        return
+
+    record.status_code = status_code
+    record.response = data
+    record.save(update_fields=['status_code', 'response'])
+
+
+def release(record):
+    # A key whose request moved money is kept, so the request can't run again
+    IdempotencyKey.objects.filter(pk=record.pk, transaction__isnull=True).delete()
+
+
+def expire(ttl=None, batch_size=5000):
+    """
+    Delete keys older than `ttl` seconds (IDEMPOTENCY_KEY_TTL by default) in batches,
+    using the created_at index. Returns the number of deleted keys.
+    """
+    ttl = settings.IDEMPOTENCY_KEY_TTL if ttl is None else ttl
+    stale = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=ttl))
+
+    deleted = 0
+    while pks := list(stale.values_list('pk', flat=True)[:batch_size]):
+        deleted += IdempotencyKey.objects.filter(pk__in=pks).delete()[0]
+    return deleted
+
+
+def begin(request, user):
+    """
+    Start a money-moving request under its Idempotency-Key header, if it has one.
+
+    Returns (record, early): ``record`` is the claimed key, None without the header;
+    ``early`` is a (data, status_code, headers) response to send instead of running
+    the request, i.e. an error or the stored response of an earlier request.
+    """
+    try:
+        key = request_key(request)
+        if not key:
+            return None, None
+        record, created = claim(user, key, request_fingerprint(request))
+    except IdempotencyError as e:
+        return None, ({"detail": e.detail}, e.status_code, {})
+
+    if not created:
+        return None, (record.response, record.status_code, {REPLAYED_HEADER: 'true'})
+    return record, None
+
+
+@contextmanager
+def running(record):
+    """
+    Run the request of a claimed key (or None): money it moves is recorded on the key,
+    and the key is released if the request raises.
+    """
+    token = current_claim.set(record)
+    try:
+        yield
+    except Exception:
+        if record is not None:
+            release(record)
+        raise
+    finally:
+        current_claim.reset(token)
+
+
+@asynccontextmanager
+async def arunning(record):
+    """Async variant of running, for the async views."""
+
+    # sync_to_async copies the context, so the balance changes run in threads see the key
+    token = current_claim.set(record)
+    try:
+        yield
+    except Exception:
+        if record is not None:
+            await sync_to_async(release)(record)
+        raise
+    finally:
+        current_claim.reset(token)
+
+
+def finish(record, status_code, data):
+    """Complete the claimed key (or None) with the response of its request."""
+
+    if record is not None:
+        complete(record, status_code, data)
+
+
+def idempotent(handler):
+    """
+    Decorator for DRF view handlers that move money.
+
+    Requests carrying an Idempotency-Key header are executed once per user and key;
+    retries get the stored response, with `Idempotent-Replayed: true`, without touching
+    wallets or the NBP API. Requests without the header run as before.
+    The async views go through the same begin/running/finish steps.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        record, early = begin(request, request.user)
+        if early is not None:
+            data, status_code, headers = early
+            return Response(data, status=status_code, headers=headers)
+
+        with running(record):
+            response = handler(view, request, *args, **kwargs)
+
+        finish(record, response.status_code, response.data)
+        return response
+
+    return wrapper
@@ -0,0 +1,237 @@
+# nbp_client.py
+
+import asyncio
+import json
+import random
+import threading
+import time
+import weakref
+from decimal import Decimal
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+class CircuitOpenError(requests.RequestException):
+
+    """Raised instead of calling the NBP API while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+
+    """
+    Thread-safe circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and every
+    call fails fast for ``reset_timeout`` seconds. Then a single trial call is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def allow(self):
+        """Return True if a call may go through, moving an expired open circuit to half-open."""
+
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                # Let exactly one trial call through
+                self._state = self.HALF_OPEN
+                return True
+
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+
+class NBPClient:
+
+    """
+    HTTP client for the NBP API.
+
+    Requests go through one keep-alive session with a bounded connection pool and
+    always carry connect and read timeouts. Connection errors, timeouts, 429 and
+    5xx responses are retried with jittered exponential backoff; once retries are
+    exhausted the failure is counted by the circuit breaker.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self, base_url, connect_timeout, read_timeout, max_retries, retry_backoff,
+        pool_size, breaker,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.pool_size = pool_size
+        self.breaker = breaker
+
+        self.session = requests.Session()
+        self.session.headers['Accept'] = 'application/json'
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            base_url=settings.NBP_API_URL,
+            connect_timeout=settings.NBP_CONNECT_TIMEOUT,
+            read_timeout=settings.NBP_READ_TIMEOUT,
+            max_retries=settings.NBP_MAX_RETRIES,
+            retry_backoff=settings.NBP_RETRY_BACKOFF,
+            pool_size=settings.NBP_POOL_SIZE,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.NBP_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.NBP_CIRCUIT_RESET_TIMEOUT,
+            ),
+        )
+
+    def get_json(self, path):
+        """GET ``path`` relative to the API root and return the JSON body with Decimal floats."""
+
+        if not self.breaker.allow():
+            raise CircuitOpenError('NBP API circuit is open, not calling it')
+
+        try:
+            response = self.fetch(f'{self.base_url}/{path.lstrip("/")}')
+        except BaseException:
+            # Whatever went wrong, a half-open trial call must settle the circuit
+            self.breaker.record_failure()
+            raise
+
+        # The API answered; a 4xx means a bad request, not an unhealthy upstream
+        self.breaker.record_success()
+        response.raise_for_status()
+        return response.json(parse_float=Decimal)
+
+    def fetch(self, url):
+        """GET ``url`` with retries, raising the last error once they are exhausted."""
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if response.status_code not in self.RETRY_STATUSES:
+                    return response
+                error = requests.HTTPError(f'{response.status_code} Server Error for url: {url}', response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            if attempt < self.max_retries:
+                time.sleep(self.backoff(attempt))
+
+        raise error
+
+    def backoff(self, attempt):
+        """Full jitter: a random delay up to retry_backoff * 2 ** attempt seconds."""
+
+        return random.uniform(0, self.retry_backoff * 2 ** attempt)
+
+
+class AsyncNBPClient:
+
+    """
+    Non-blocking counterpart of NBPClient for async views.
+
+    Uses one pooled httpx.AsyncClient per event loop with the same timeouts,
+    retry policy and circuit breaker as the synchronous client it mirrors.
+    """
+
+    def __init__(self, sync_client):
+        self.sync_client = sync_client
+        self._clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+
+    @property
+    def breaker(self):
+        return self.sync_client.breaker
+
+    def http_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+
+        if client is None:
+            connect_timeout, read_timeout = self.sync_client.timeout
+            client = httpx.AsyncClient(
+                base_url=self.sync_client.base_url,
+                headers={'Accept': 'application/json'},
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=self.sync_client.pool_size, max_keepalive_connections=self.sync_client.pool_size),
+            )
+            self._clients[loop] = client
+
+        return client
+
+    async def get_json(self, path):
+        """Async variant of NBPClient.get_json, raising the same requests exceptions."""
+
+        if not self.breaker.allow():
+            raise CircuitOpenError('NBP API circuit is open, not calling it')
+
+        try:
+            response = await self.fetch(f'/{path.lstrip("/")}')
+        except BaseException:
+            # Including cancellation: a half-open trial call must settle the circuit
+            self.breaker.record_failure()
+            raise
+
+        self.breaker.record_success()
+        if response.is_error:
+            raise requests.HTTPError(f'{response.status_code} Client Error for url: {response.url}')
+        return json.loads(response.content, parse_float=Decimal)
+
+    async def fetch(self, url):
+        """Async variant of NBPClient.fetch."""
+
+        max_retries = self.sync_client.max_retries
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = await self.http_client().get(url)
+                if response.status_code not in NBPClient.RETRY_STATUSES:
+                    return response
+                error = requests.HTTPError(f'{response.status_code} Server Error for url: {response.url}')
+            except httpx.TimeoutException as e:
+                error = requests.Timeout(str(e))
+            except httpx.TransportError as e:
+                error = requests.ConnectionError(str(e))
+
+            if attempt < max_retries:
+                await asyncio.sleep(self.sync_client.backoff(attempt))
+
+        raise error
+
+
+nbp_client = NBPClient.from_settings()
+async_nbp_client = AsyncNBPClient(nbp_client)
@@ -0,0 +1,104 @@
+# onboarding.py
+
+import csv
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from api.models.user import User
+from api.models.wallet import Wallet
+from api.utils.user_list_cache import invalidate_user_list
+
+
+ONBOARDING_COLUMNS = ('email', 'first_name', 'last_name', 'password')
+
+
+def read_users(f):
+    """
+    Yield (line number, row) for the data lines of a user CSV.
+    The file is read lazily, so memory doesn't grow with its size.
+    """
+    reader = csv.DictReader(f)
+    missing = set(ONBOARDING_COLUMNS) - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f"Missing user columns: {', '.join(sorted(missing))}")
+
+    # The header is line 1
+    yield from ((reader.line_num, row) for row in reader)
+
+
+def parse_user(row):
+    """
+    Validate one user row, returning (email, first name, last name, password).
+    The email is normalized like UserManager.create_user does.
+    Raises ValueError with the reason the line is rejected.
+    """
+    email = User.objects.normalize_email(row['email'].strip()).lower()
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise ValueError(f"invalid email {row['email']!r}")
+
+    first_name, last_name = row['first_name'].strip(), row['last_name'].strip()
+    if not first_name or not last_name:
+        raise ValueError("missing first or last name")
+    if len(first_name) > 250 or len(last_name) > 250:
+        raise ValueError("first or last name longer than 250 characters")
+
+    if not row['password']:
+        raise ValueError("missing password")
+
+    return email, first_name, last_name, row['password']
+
+
+def existing_emails(emails):
+    return set(User.objects.filter(email__in=list(emails)).values_list('email', flat=True))
+
+
+def init_hasher():
+    # Worker processes started with `spawn` (macOS, Windows) don't inherit the configured apps
+    django.setup()
+
+
+def hash_passwords(pool, passwords, workers):
+    """
+    Hash ``passwords`` with the default hasher, spread over the processes of ``pool``.
+    The work is submitted right away and the hashes are returned as an iterator, so the
+    caller can write the previous chunk to the database in the meantime.
+    """
+    return pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4)))
+
+
+@transaction.atomic
+def onboard_chunk(users):
+    """
+    Create a chunk of users and their default wallets, as one unit.
+    - `users` are (line number, email, first name, last name, password hash).
+    - Emails that already exist, or repeat one earlier in the chunk, are rejected.
+    - Users and wallets are written with one bulk insert each. bulk_create doesn't send
+      post_save, so the default wallet of create_wallet_for_user is created here, and
+      the cached user list is dropped here too.
+    Returns the number of users created and the rejected lines as (line number, reason).
+    """
+    existing = existing_emails(user[1] for user in users)
+
+    rejected = []
+    new_users = []
+    for line_number, email, first_name, last_name, password in users:
+        if email in existing:
+            rejected.append((line_number, f"user {email} already exists"))
+            continue
+        existing.add(email)
+        new_users.append(User(email=email, first_name=first_name, last_name=last_name, password=password))
+
+    User.objects.bulk_create(new_users)
+    Wallet.objects.bulk_create(
+        Wallet(user=user, currency=Wallet.DEFAULT_CURRENCY, wallet_address=Wallet.generate_address(user.pk))
+        for user in new_users
+    )
+    transaction.on_commit(invalidate_user_list)
+
+    return len(new_users), rejected
@@ -0,0 +1,115 @@
+# pagination.py
+
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+
+    """
+    Keyset (cursor) pagination over (date, id), newest first.
+
+    The cursor holds the (date, id) of the last row served, so any page is a single
+    range scan on the (user, -date, -id) index:
+
+        WHERE date < :date OR (date = :date AND id < :id) ORDER BY date DESC, id DESC LIMIT n
+
+    Deep pages cost the same as the first one, unlike OFFSET based pagination.
+    """
+
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by('-date', '-id')
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            date, pk = cursor
+            queryset = queryset.filter(Q(date__lt=date) | Q(date=date, id__lt=pk))
+
+        # Fetch one extra row to know whether there is a next page
+        rows = list(queryset[:self.page_size + 1])
+        self.page = rows[:self.page_size]
+        self.has_next = len(rows) > self.page_size
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            date, pk = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').split('|')
+            return datetime.fromisoformat(date), int(pk)
+        except (ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row):
+        return base64.urlsafe_b64encode(f'{row.date.isoformat()}|{row.pk}'.encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        url = self.request.build_absolute_uri()
+
+        if not self.has_next:
+            return None
+
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_first_link(self):
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'first': self.get_first_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'first': {'type': 'string', 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class UserCursorPagination(CursorPagination):
+
+    """
+    Cursor pagination of the user list by id.
+
+    Every page is an index range scan on the primary key with no COUNT query, and
+    clients can't ask for more than ``max_page_size`` users at once.
+    """
+
+    ordering = 'id'
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = 'page_size'
@@ -0,0 +1,64 @@
+# postgres.py
+
+from contextlib import contextmanager
+
+from django.db import migrations
+
+
+@contextmanager
+def no_statement_timeout(schema_editor):
+    """
+    Lift the statement timeout of the connection (POSTGRES_STATEMENT_TIMEOUT) for a
+    long migration step on PostgreSQL, such as an index build or a backfill, so it
+    isn't cancelled halfway. The timeout is restored afterwards.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        yield
+        return
+
+    schema_editor.execute('SET statement_timeout = 0')
+    try:
+        yield
+    finally:
+        schema_editor.execute('RESET statement_timeout')
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+
+    """
+    AddIndex that builds the index with CREATE INDEX CONCURRENTLY on PostgreSQL, so
+    writes to a large table aren't blocked meanwhile, and normally on other databases.
+    The build isn't subject to the statement timeout, and a rerun replaces the invalid
+    index an interrupted build leaves behind.
+
+    Like django.contrib.postgres.operations.AddIndexConcurrently, which can't be used
+    here since it requires psycopg even when migrating SQLite, it needs a migration
+    with ``atomic = False``.
+    """
+
+    def describe(self):
+        return f'Concurrently create index {self.index.name} on {self.model_name}'
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        if schema_editor.connection.vendor == 'postgresql':
+            with no_statement_timeout(schema_editor):
+                # A cancelled build leaves an invalid index behind, which would make the rerun fail
+                schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(self.index.name)}')
+                schema_editor.add_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        if schema_editor.connection.vendor == 'postgresql':
+            with no_statement_timeout(schema_editor):
+                schema_editor.remove_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.remove_index(model, self.index)
@@ -0,0 +1,199 @@
+# rate_cache.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+
+NBP_TIMEZONE = ZoneInfo('Europe/Warsaw')
+
+
+def next_publication(now, publication_time):
+    """
+    Return the timestamp of the next NBP table publication after ``now``.
+
+    ``publication_time`` is an 'HH:MM' string in Warsaw time. Weekends are skipped,
+    public holidays are not (an extra refresh on a holiday is harmless).
+    """
+    hour, minute = (int(part) for part in publication_time.split(':'))
+    local_now = datetime.fromtimestamp(now, NBP_TIMEZONE)
+    candidate = local_now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    if candidate <= local_now:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+
+    return candidate.timestamp()
+
+
+def last_publication_date(now, publication_time):
+    """Return the Warsaw date of the latest NBP table publication at or before ``now``."""
+
+    hour, minute = (int(part) for part in publication_time.split(':'))
+    local_now = datetime.fromtimestamp(now, NBP_TIMEZONE)
+    candidate = local_now.date()
+
+    if (local_now.hour, local_now.minute) < (hour, minute):
+        candidate -= timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate -= timedelta(days=1)
+
+    return candidate
+
+
+class RateCache:
+
+    """
+    Thread-safe in-process cache for exchange rates.
+
+    An entry is fresh until ``ttl`` seconds have passed or the next NBP publication,
+    whichever comes first. A stale entry is still served for ``stale_ttl`` seconds
+    while a single background thread refreshes it. Concurrent misses for the same
+    key share one in-flight fetch instead of each calling the loader.
+
+    ``background_cleanup`` is called at the end of every background refresh, e.g.
+    to close the database connections the refreshing thread opened.
+    """
+
+    def __init__(self, ttl, stale_ttl, publication_time=None, background_cleanup=None, clock=time.time):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.publication_time = publication_time
+        self.background_cleanup = background_cleanup
+        self._clock = clock
+        self._entries = {}  # key -> (value, fresh_until)
+        self._inflight = {}  # key -> Future shared by every caller waiting on the key
+        self._tasks = {}  # key -> asyncio.Task shared by every coroutine waiting on the key
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        """Return the cached value for ``key``, calling ``loader()`` on a miss."""
+
+        now = self._clock()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                value, fresh_until = entry
+
+                if now < fresh_until:
+                    return value
+
+                if now < fresh_until + self.stale_ttl:
+                    # Stale while revalidate: answer now, refresh in the background
+                    future, owner = self._claim(key)
+                    if owner:
+                        threading.Thread(target=self._refresh, args=(key, loader, future), daemon=True).start()
+                    return value
+
+            future, owner = self._claim(key)
+
+        if owner:
+            self._load(key, loader, future)
+
+        return future.result()
+
+    async def aget(self, key, loader):
+        """
+        Async variant of get(); ``loader`` is a coroutine function.
+
+        Concurrent misses on the same event loop await one shared task, so waiting
+        on a fetch never blocks the loop or spends a thread.
+        """
+
+        now = self._clock()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                value, fresh_until = entry
+
+                if now < fresh_until:
+                    return value
+
+                if now < fresh_until + self.stale_ttl:
+                    self._claim_task(key, loader)
+                    return value
+
+            task = self._claim_task(key, loader)
+
+        # Shield the shared task so one cancelled caller doesn't cancel it for everyone
+        return await asyncio.shield(task)
+
+    def peek(self, key):
+        """Return the last value stored for ``key`` regardless of its age, or None."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, self._fresh_until(self._clock()))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _claim(self, key):
+        # Must be called with self._lock held
+        future = self._inflight.get(key)
+        if future is not None:
+            return future, False
+
+        future = Future()
+        self._inflight[key] = future
+        return future, True
+
+    def _claim_task(self, key, loader):
+        # Must be called with self._lock held, from a running event loop
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(key)
+
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._aload(key, loader))
+            # Background refreshes may fail unobserved, don't log them as never retrieved
+            task.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._tasks[key] = task
+
+        return task
+
+    async def _aload(self, key, loader):
+        value = await loader()
+
+        with self._lock:
+            self._entries[key] = (value, self._fresh_until(self._clock()))
+        return value
+
+    def _refresh(self, key, loader, future):
+        try:
+            self._load(key, loader, future)
+        finally:
+            if self.background_cleanup is not None:
+                self.background_cleanup()
+
+    def _load(self, key, loader, future):
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._entries[key] = (value, self._fresh_until(self._clock()))
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def _fresh_until(self, now):
+        fresh_until = now + self.ttl
+        if self.publication_time:
+            fresh_until = min(fresh_until, next_publication(now, self.publication_time))
+        return fresh_until
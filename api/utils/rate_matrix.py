@@ -0,0 +1,81 @@
+# rate_matrix.py
+
+import hashlib
+import json
+import threading
+from decimal import localcontext
+
+from api.models.wallet import Wallet
+
+
+# Significant digits of a cross rate; enough for both IDR -> USD and USD -> IDR
+MATRIX_PRECISION = 10
+
+
+def matrix_currencies(snapshot):
+    """Currencies a wallet can hold that the snapshot quotes, in Wallet.CURRENCIES order without duplicates."""
+
+    return [code for code in dict.fromkeys(code for code, _ in Wallet.CURRENCIES) if code in snapshot]
+
+
+def cross_rate_matrix(snapshot, currencies):
+    """
+    Return {source: {destination: rate}} for every pair of ``currencies``.
+
+    Each row divides one PLN mid by the list of all mids, rounded to
+    MATRIX_PRECISION significant digits, so the whole N x N matrix is built in one
+    pass over the snapshot without looking up a rate per pair.
+    """
+
+    mids = [snapshot.mid(code) for code in currencies]
+
+    with localcontext(prec=MATRIX_PRECISION):
+        return {
+            source: dict(zip(currencies, (source_mid / mid for mid in mids)))
+            for source, source_mid in zip(currencies, mids)
+        }
+
+
+class RenderedMatrix:
+
+    """The cross-rate matrix of one snapshot serialized to JSON, with the ETag of that body."""
+
+    def __init__(self, snapshot):
+        currencies = matrix_currencies(snapshot)
+        rates = cross_rate_matrix(snapshot, currencies)
+
+        self.key = (snapshot.table, snapshot.number, snapshot.effective_date)
+        self.content = json.dumps({
+            'table': snapshot.table,
+            'number': snapshot.number,
+            'effective_date': snapshot.effective_date.isoformat(),
+            'currencies': currencies,
+            'rates': {
+                source: {destination: str(rate) for destination, rate in row.items()}
+                for source, row in rates.items()
+            },
+        }, separators=(',', ':')).encode()
+        self.etag = hashlib.sha256(self.content).hexdigest()[:32]
+
+
+_lock = threading.Lock()
+_rendered = None
+
+
+def rendered_matrix(snapshot):
+    """
+    Return the RenderedMatrix of ``snapshot``, computing and serializing it only once
+    per NBP table: the matrix only changes when a new table is published.
+    """
+
+    global _rendered
+
+    key = (snapshot.table, snapshot.number, snapshot.effective_date)
+    rendered = _rendered
+    if rendered is not None and rendered.key == key:
+        return rendered
+
+    with _lock:
+        if _rendered is None or _rendered.key != key:
+            _rendered = RenderedMatrix(snapshot)
+        return _rendered
@@ -0,0 +1,95 @@
+# rate_provider.py
+
+from datetime import date
+from decimal import Decimal
+
+from api.utils.nbp_client import async_nbp_client, nbp_client
+
+
+class RateSnapshot:
+
+    """
+    Mid rates of one published NBP table, expressed in PLN per unit of currency.
+
+    PLN itself is always present with a mid of 1 so any pair of supported
+    currencies can be priced from the same snapshot. ``records`` maps currencies
+    to the stored ExchangeRate rows the rates were loaded from, if any.
+    """
+
+    def __init__(self, table, number, effective_date, rates, records=None):
+        self.table = table
+        self.number = number
+        self.effective_date = effective_date
+        self.rates = {'PLN': Decimal(1), **rates}
+        self.records = records or {}
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a snapshot from ExchangeRate rows sharing one table and effective date."""
+
+        records = {record.currency: record for record in records}
+        first = next(iter(records.values()))
+
+        return cls(
+            table=first.table,
+            number=first.table_number,
+            effective_date=first.effective_date,
+            rates={currency: record.mid for currency, record in records.items()},
+            records=records,
+        )
+
+    def __contains__(self, currency):
+        return currency in self.rates
+
+    def mid(self, currency):
+        """Return the mid rate of ``currency``, raising KeyError if the table does not quote it."""
+
+        try:
+            return self.rates[currency]
+        except KeyError:
+            raise KeyError(f'No {self.table} table rate for {currency}')
+
+    def record(self, currency):
+        """Return the stored ExchangeRate row of ``currency``, or None for PLN and unsaved snapshots."""
+
+        return self.records.get(currency)
+
+    def cross_rate(self, source_currency, destination_currency):
+        """Return how many units of ``destination_currency`` one unit of ``source_currency`` buys."""
+
+        if source_currency == destination_currency:
+            return Decimal(1)
+
+        return self.mid(source_currency) / self.mid(destination_currency)
+
+
+class NBPRateProvider:
+
+    """Loads whole NBP exchange rate tables in a single request."""
+
+    def __init__(self, client=None, async_client=None, table='A'):
+        self.client = client or nbp_client
+        self.async_client = async_client or async_nbp_client
+        self.table = table
+
+    def parse_table(self, payload):
+        """Build a RateSnapshot from the JSON document of ``/exchangerates/tables/{table}/``."""
+
+        document = payload[0]
+
+        return RateSnapshot(
+            table=document['table'],
+            number=document['no'],
+            effective_date=date.fromisoformat(document['effectiveDate']),
+            rates={rate['code']: Decimal(str(rate['mid'])) for rate in document['rates']},
+        )
+
+    def fetch_snapshot(self):
+        """Fetch the current table and return it as a RateSnapshot."""
+
+        return self.parse_table(self.client.get_json(f'exchangerates/tables/{self.table.lower()}/'))
+
+    async def afetch_snapshot(self):
+        """Async variant of fetch_snapshot using the non-blocking client."""
+
+        return self.parse_table(await self.async_client.get_json(f'exchangerates/tables/{self.table.lower()}/'))
@@ -0,0 +1,149 @@
+# settlements.py
+
+import csv
+import hashlib
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction
+
+from api.models.ledger_entry import LedgerEntry
+from api.models.transaction import Transaction
+from api.models.wallet import Wallet
+from api.utils.balances import CENT, lock_wallets, record_entries
+
+
+SETTLEMENT_COLUMNS = ('email', 'currency', 'transaction_type', 'amount', 'bank_account_address')
+SETTLEMENT_TYPES = ('DEPOSIT', 'WITHDRAWL')
+
+
+def file_checksum(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_lines(f, skip=0):
+    """
+    Yield (line number, row) for the data lines of a settlement CSV, skipping the first `skip`.
+    The file is read lazily, so memory doesn't grow with its size.
+    """
+    reader = csv.DictReader(f)
+    missing = set(SETTLEMENT_COLUMNS) - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f"Missing settlement columns: {', '.join(sorted(missing))}")
+
+    # The header is line 1
+    yield from islice(((reader.line_num, row) for row in reader), skip, None)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def parse_line(row):
+    """
+    Validate one settlement row, returning (email, currency, type, amount, bank account).
+    Raises ValueError with the reason the line is rejected.
+    """
+    transaction_type = row['transaction_type'].strip().upper()
+    if transaction_type not in SETTLEMENT_TYPES:
+        raise ValueError(f"unknown transaction type {row['transaction_type']!r}")
+
+    try:
+        amount = Decimal(row['amount'].strip())
+    except InvalidOperation:
+        raise ValueError(f"invalid amount {row['amount']!r}")
+    if not amount.is_finite() or amount < CENT or amount != amount.quantize(CENT):
+        raise ValueError(f"invalid amount {row['amount']!r}")
+
+    bank_account_address = row['bank_account_address'].strip()
+    if not bank_account_address:
+        raise ValueError("missing bank account address")
+
+    return row['email'].strip().lower(), row['currency'].strip().upper(), transaction_type, amount, bank_account_address
+
+
+@transaction.atomic
+def apply_chunk(settlement, lines):
+    """
+    Apply a chunk of settlement lines and advance the import checkpoint, as one unit.
+    - Wallets of the whole chunk are resolved and locked once, not per line.
+    - Lines are applied in file order against in-memory balances; a withdrawal
+      larger than the balance at that point is rejected, like WalletWithdrawView does.
+    - Changed balances are written with one bulk update, the Transaction rows and
+      their ledger entries with one bulk insert each, and the activity rollups
+      once per (user, currency, month) of the chunk.
+    Returns the rejected lines as (line number, reason).
+    """
+    rejected = []
+    parsed = []
+    for line_number, row in lines:
+        try:
+            parsed.append((line_number, parse_line(row)))
+        except (ValueError, AttributeError) as e:
+            rejected.append((line_number, str(e)))
+
+    emails = {line[0] for _, line in parsed}
+    currencies = {line[1] for _, line in parsed}
+    matches = (
+        Wallet.objects.filter(user__email__in=emails, currency__in=currencies)
+        .select_related('user').only('pk', 'currency', 'user__email')
+    )
+    keys = {wallet.pk: (wallet.user.email, wallet.currency) for wallet in matches}
+    wallets_by_key = {keys[pk]: wallet for pk, wallet in lock_wallets(*matches).items()}
+
+    changed = {}
+    transactions = []
+    sides = []
+    for line_number, (email, currency, transaction_type, amount, bank_account_address) in parsed:
+        wallet = wallets_by_key.get((email, currency))
+        if wallet is None:
+            rejected.append((line_number, f"no {currency} wallet for {email}"))
+            continue
+
+        if transaction_type == 'DEPOSIT':
+            wallet.balance += amount
+        elif wallet.balance < amount:
+            rejected.append((line_number, "insufficient balance for this withdrawal"))
+            continue
+        else:
+            wallet.balance -= amount
+
+        bank_side = (bank_account_address, None, currency, amount, None)
+        wallet_side = (wallet.wallet_address, wallet, currency, amount, wallet.balance)
+        sides.append((bank_side, wallet_side) if transaction_type == 'DEPOSIT' else (wallet_side, bank_side))
+
+        changed[wallet.pk] = wallet
+        transactions.append(Transaction(
+            user_id=wallet.user_id,
+            source=bank_account_address,
+            destination=wallet.wallet_address,
+            # A withdrawal debits the wallet, so it is the source side; `destination` keeps its address all the same
+            source_wallet=wallet if transaction_type == 'WITHDRAWL' else None,
+            destination_wallet=wallet if transaction_type == 'DEPOSIT' else None,
+            bank_account=bank_account_address,
+            transaction_type=transaction_type,
+            amount=amount,
+        ))
+
+    for wallet in changed.values():
+        wallet.version += 1
+    Wallet.objects.bulk_update(changed.values(), ['balance', 'version'])
+    Transaction.objects.bulk_create(transactions)
+    record_entries(
+        entry
+        for record, (debit, credit) in zip(transactions, sides)
+        for entry in LedgerEntry.objects.movement(record, debit, credit)
+    )
+
+    settlement.lines_processed += len(lines)
+    settlement.lines_rejected += len(rejected)
+    settlement.save(update_fields=['lines_processed', 'lines_rejected'])
+
+    rejected.sort()
+    return rejected
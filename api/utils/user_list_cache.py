@@ -0,0 +1,34 @@
+# user_list_cache.py
+
+import uuid
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+
+# Shared by the workers, so a new version drops the cached pages of all of them at once
+cache = ConnectionProxy(caches, 'shared')
+
+
+USER_LIST_VERSION_KEY = 'user-list:version'
+
+
+def user_list_version():
+    """
+    Return the current version of the cached user list pages.
+    Cached pages are keyed by version, so changing it drops all of them at once.
+    """
+    version = cache.get(USER_LIST_VERSION_KEY)
+    if version is None:
+        cache.add(USER_LIST_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(USER_LIST_VERSION_KEY)
+    return version
+
+
+def user_list_cache_key(host, page_size, cursor):
+    # Pages hold absolute next/previous links, hence the host
+    return f'user-list:{user_list_version()}:{host}:{page_size}:{cursor or ""}'
+
+
+def invalidate_user_list():
+    cache.set(USER_LIST_VERSION_KEY, uuid.uuid4().hex, None)
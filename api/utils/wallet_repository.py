@@ -0,0 +1,68 @@
+# wallet_repository.py
+
+from django.http import Http404
+
+from api.models.wallet import Wallet
+
+
+class WalletRepository:
+
+    """
+    Identity map of the authenticated user's wallets, scoped to one request.
+
+    The first lookup loads all of the user's wallets in one query; later lookups by
+    views, serializers and permissions are served from memory and return the same
+    instances. Each wallet's ``user`` is the request's user, so ownership checks
+    don't query either. Balances are as loaded: the balance service locks and
+    re-reads the rows it changes.
+    """
+
+    request_attr = '_wallet_repository'
+    not_found_message = "Wallet with this currency does not exist for this user."
+
+    def __init__(self, user):
+        self.user = user
+        self.wallets = None
+
+    @classmethod
+    def for_request(cls, request):
+        repository = getattr(request, cls.request_attr, None)
+        if repository is None:
+            repository = cls(request.user)
+            setattr(request, cls.request_attr, repository)
+        return repository
+
+    def queryset(self):
+        return Wallet.objects.filter(user=self.user).order_by('pk')
+
+    def attach(self, wallets):
+        for wallet in wallets:
+            wallet.user = self.user
+        self.wallets = {wallet.currency: wallet for wallet in wallets}
+        return self.wallets
+
+    def all(self):
+        """Return the user's wallets keyed by currency."""
+
+        if self.wallets is None:
+            self.attach(list(self.queryset()))
+        return self.wallets
+
+    async def aall(self):
+        """Async variant of all(), for the async views. Later sync lookups use what it loaded."""
+
+        if self.wallets is None:
+            self.attach([wallet async for wallet in self.queryset()])
+        return self.wallets
+
+    def currencies(self):
+        return list(self.all())
+
+    def get(self, currency):
+        return self.all().get(currency)
+
+    def get_or_404(self, currency):
+        wallet = self.get(currency)
+        if wallet is None:
+            raise Http404(self.not_found_message)
+        return wallet
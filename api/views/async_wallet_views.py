@@ -0,0 +1,238 @@
+import json
+import math
+import requests
+from decimal import Decimal, InvalidOperation
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from api.authentication.token_authentication import aget_token
+
+from api.throttling.token_bucket import TokenBucketThrottle
+from api.serializers.wallet_serializer import WalletDepositWithdrawSerializer, WalletTransferSerializer
+from api.utils.exchange_rates import aget_rate_snapshot
+from api.utils import balances, idempotency
+from api.utils.wallet_repository import WalletRepository
+
+
+class AsyncAPIView(View):
+    """
+    Base class for the async (ASGI) wallet views.
+    - DRF views can't be async, so this handles token authentication with the
+      async cache and ORM, parses JSON/form bodies and renders JSON the way DRF does.
+    - Money is moved in a short atomic block run in a thread, because Django's
+      async ORM doesn't support transactions; waiting on NBP never holds a thread.
+    - Requests are throttled per user with the `throttle_scope` bucket, like the sync views.
+    """
+    parsers = (JSONParser(), FormParser(), MultiPartParser())
+    throttle_scope = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token authenticated API, like DRF's APIView
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def authenticate(self, request):
+        """
+        Resolve the user from an `Authorization: Token <key>` header.
+        """
+        auth = request.headers.get('Authorization', '').split()
+        if len(auth) != 2 or auth[0].lower() != 'token':
+            return None
+
+        token = await aget_token(auth[1])
+        if token is None or not token.user.is_active:
+            return None
+        return token.user
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await self.authenticate(request)
+        if user is None:
+            return self.respond(
+                {"detail": "Authentication credentials were not provided."},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        request.user = user
+
+        throttle = TokenBucketThrottle()
+        if not await sync_to_async(throttle.allow_request)(request, self):
+            response = self.respond(
+                {"detail": f"Request was throttled. Expected available in {math.ceil(throttle.wait())} seconds."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
+            response['Retry-After'] = str(math.ceil(throttle.wait()))
+            return response
+
+        # Every async view moves money, so honour Idempotency-Key like the @idempotent sync views
+        record, early = await sync_to_async(idempotency.begin)(request, user)
+        if early is not None:
+            data, status_code, headers = early
+            return self.respond(data, status=status_code, headers=headers)
+
+        async with idempotency.arunning(record):
+            response = await self.handle(request, *args, **kwargs)
+
+        if record is not None:
+            await sync_to_async(idempotency.finish)(record, response.status_code, json.loads(response.content))
+        return response
+
+    async def handle(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as e:
+            # Validation, parse (400) and unsupported media type (415) errors, shaped like DRF's
+            data = e.detail if isinstance(e.detail, (list, dict)) else {"detail": e.detail}
+            return self.respond(data, status=e.status_code)
+        except Http404 as e:
+            return self.respond({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+    def get_data(self, request):
+        return Request(request, parsers=self.parsers).data
+
+    def respond(self, data, status=status.HTTP_200_OK, headers=None):
+        return HttpResponse(
+            JSONRenderer().render(data), status=status, content_type='application/json', headers=headers
+        )
+
+    async def get_wallet(self, request, currency):
+        repository = WalletRepository.for_request(request)
+        await repository.aall()
+        return repository.get_or_404(currency)
+
+
+class AsyncWalletDepositView(AsyncAPIView):
+    """
+    Async API View to deposit money into a specified wallet.
+    """
+    throttle_scope = 'deposit_withdraw'
+
+    async def put(self, request, currency):
+        wallet = await self.get_wallet(request, currency)
+
+        serializer = WalletDepositWithdrawSerializer(data=self.get_data(request))
+        serializer.is_valid(raise_exception=True)
+
+        bank_account_address = serializer.validated_data['bank_account_address']
+        amount = serializer.validated_data['amount']
+
+        wallet = await sync_to_async(balances.deposit)(request.user, wallet, bank_account_address, amount)
+
+        return self.respond({
+            "status": "success",
+            "type": "deposit",
+            "bank_account": bank_account_address,
+            "amount": amount,
+            "wallet_balance": wallet.balance,
+            "wallet_currency": wallet.currency,
+        })
+
+    patch = put
+
+
+class AsyncWalletWithdrawView(AsyncAPIView):
+    """
+    Async API View to withdraw money from a specified wallet.
+    """
+    throttle_scope = 'deposit_withdraw'
+
+    async def put(self, request, currency):
+        wallet = await self.get_wallet(request, currency)
+
+        serializer = WalletDepositWithdrawSerializer(data=self.get_data(request))
+        serializer.is_valid(raise_exception=True)
+
+        bank_account_address = serializer.validated_data['bank_account_address']
+        amount = serializer.validated_data['amount']
+
+        try:
+            wallet = await sync_to_async(balances.withdraw)(request.user, wallet, bank_account_address, amount)
+        except balances.InsufficientFunds:
+            raise ValidationError("Insufficient balance for this withdrawal.")
+
+        return self.respond({
+            "status": "success",
+            "type": "withdrawl",
+            "bank_account": bank_account_address,
+            "amount": amount,
+            "wallet_balance": wallet.balance,
+            "wallet_currency": wallet.currency,
+        })
+
+    patch = put
+
+
+class AsyncWalletTransferView(AsyncAPIView):
+    """
+    Async API View to transfer money between two wallets with different currencies.
+    - Same contract as WalletTransferView, but the NBP rate fetch is awaited with a
+      non-blocking HTTP client, so one ASGI worker can hold many transfers in flight.
+    """
+    throttle_scope = 'transfer'
+
+    async def fetch_exchange_rate(self, source_currency, destination_currency):
+        """
+        Calculate the conversion rate from the cached NBP table A snapshot.
+        """
+        try:
+            snapshot = await aget_rate_snapshot()
+            return snapshot.cross_rate(source_currency, destination_currency), snapshot
+        except (requests.RequestException, ValueError, KeyError, InvalidOperation) as e:
+            # ValueError: the NBP response wasn't valid JSON
+            raise ValidationError(f"Failed to fetch exchange rates: {str(e)}")
+
+    async def post(self, request):
+        # Loaded once here, the serializer's currency choices are served from memory
+        wallets = await WalletRepository.for_request(request).aall()
+        serializer = WalletTransferSerializer(data=self.get_data(request), context={'request': request})
+        serializer.is_valid(raise_exception=True)
+
+        source_currency = serializer.validated_data['source_currency']
+        destination_currency = serializer.validated_data['destination_currency']
+        amount = serializer.validated_data['amount']  # Amount in source currency
+
+        source_wallet = wallets.get(source_currency)
+        destination_wallet = wallets.get(destination_currency)
+
+        if source_wallet is None or destination_wallet is None:
+            return self.respond(
+                {"error": "Source or destination wallet not found."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        if source_wallet.balance < amount:
+            return self.respond(
+                {"error": "Insufficient funds in the source wallet."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        exchange_rate, snapshot = await self.fetch_exchange_rate(source_currency, destination_currency)
+        converted_amount = balances.credited_amount(Decimal(amount) * exchange_rate)
+
+        try:
+            source_wallet, destination_wallet = await sync_to_async(balances.transfer)(
+                request.user, source_wallet, destination_wallet, amount, converted_amount, snapshot
+            )
+        except balances.InsufficientFunds:
+            # The balance changed while we were waiting on the exchange rate
+            return self.respond(
+                {"error": "Insufficient funds in the source wallet."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return self.respond({
+            "status": "success",
+            "source_currency": source_currency,
+            "destination_currency": destination_currency,
+            "source_balance": str(source_wallet.balance),
+            "destination_balance": str(destination_wallet.balance),
+            "exchange_rate": str(exchange_rate),
+            "source_amount": str(amount),
+            "destination_amount": str(converted_amount)
+        }, status=status.HTTP_200_OK)
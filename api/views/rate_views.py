@@ -0,0 +1,39 @@
+import requests
+from decimal import InvalidOperation
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.utils.exchange_rates import get_rate_snapshot
+from api.utils.rate_matrix import rendered_matrix
+
+
+class RateMatrixView(APIView):
+    """
+    API View to get the cross rates between every pair of wallet currencies.
+    - `rates[source][destination]` is how many units of `destination` one unit of
+      `source` buys, from the current NBP table A mid rates.
+    - The JSON body is built once per NBP table. Clients revalidate it with
+      `If-None-Match` and get a `304 Not Modified` until a new table is published.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            matrix = rendered_matrix(get_rate_snapshot())
+        except (requests.RequestException, KeyError, InvalidOperation) as e:
+            return Response(
+                {"error": f"Failed to fetch exchange rates: {str(e)}"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        response = get_conditional_response(request, etag=f'"{matrix.etag}"')
+        if response is None:
+            response = HttpResponse(matrix.content, content_type='application/json')
+        response['ETag'] = f'"{matrix.etag}"'
+        # Cacheable, but always revalidated, since a new table can be published at any time
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
@@ -1,17 +1,209 @@
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.db import connection
+from django.db.models import Q
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+
+from api.models.activity_rollup import ActivityRollup
 from api.models.transaction import Transaction
-from api.serializers.transaction_serializer import TransactionSerializer
+from api.models.wallet import Wallet
+from api.serializers.transaction_serializer import (
+    TransactionSerializer, TransactionFilterSerializer, ActivityStatsFilterSerializer, ActivityRollupSerializer
+)
+from api.utils.pagination import KeysetPagination
 from rest_framework import generics, permissions
 
-class TransactionListView(generics.ListAPIView):
+
+def prefix_filter(field, prefix):
+    """
+    Match values of ``field`` starting with ``prefix`` with an index.
+    - PostgreSQL: a LIKE 'prefix%' served by the varchar_pattern_ops indexes of
+      Transaction. A range would depend on the database collation there.
+    - SQLite: a range, since its case-insensitive LIKE can't use an index. Text is
+      compared by codepoint there, so every value with the prefix is in the range.
+    """
+    if connection.vendor == 'postgresql':
+        return Q(**{f'{field}__startswith': prefix})
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\U0010ffff'})
+
+
+class TransactionFilterMixin:
+    """
+    Filters a user's transactions by the query parameters of TransactionFilterSerializer.
+    - Every filter is a range or equality on an indexed column of Transaction.
+    """
+
+    def filter_transactions(self, queryset):
+        serializer = TransactionFilterSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = serializer.validated_data
+
+        if 'date_from' in filters:
+            queryset = queryset.filter(date__gte=self.start_of_day(filters['date_from']))
+
+        if 'date_to' in filters:
+            queryset = queryset.filter(date__lt=self.start_of_day(filters['date_to'] + timedelta(days=1)))
+
+        if 'transaction_type' in filters:
+            queryset = queryset.filter(transaction_type=filters['transaction_type'])
+
+        if 'currency' in filters:
+            # A user has at most one wallet per currency
+            wallet = (
+                Wallet.objects.filter(user=self.request.user, currency=filters['currency'])
+                .values_list('pk', flat=True)
+                .first()
+            )
+            queryset = (
+                queryset.filter(Q(source_wallet=wallet) | Q(destination_wallet=wallet)) if wallet else queryset.none()
+            )
+
+        if 'counterparty' in filters:
+            queryset = queryset.filter(
+                prefix_filter('source', filters['counterparty']) | prefix_filter('destination', filters['counterparty'])
+            )
+
+        return queryset
+
+    @staticmethod
+    def start_of_day(day):
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class TransactionListView(TransactionFilterMixin, generics.ListAPIView):
     """
     API View to list all transactions for the authenticated user.
     - Users can only see their own transactions.
+    - Filter with `date_from`, `date_to`, `transaction_type`, `currency` and `counterparty`.
+    - Paginated newest first with a (date, id) cursor, see KeysetPagination.
+    - The user and wallets of a page are joined into its query, so the number of
+      queries doesn't grow with the number of transactions.
     """
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
         Filter transactions to only include those belonging to the logged-in user.
         """
-        return Transaction.objects.filter(user=self.request.user)
+        queryset = (
+            Transaction.objects.filter(user=self.request.user)
+            .select_related('user', 'source_wallet', 'destination_wallet')
+        )
+        return self.filter_transactions(queryset)
+
+
+class Echo:
+    """
+    File-like object that returns what is written to it, so csv.writer can
+    produce one line at a time for a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+class TransactionExportView(TransactionFilterMixin, generics.GenericAPIView):
+    """
+    API View to export the authenticated user's transactions as CSV or NDJSON.
+    - Accepts the same filters as TransactionListView.
+    - Rows are streamed from a chunked database iterator, with the wallet currencies
+      joined in, so memory stays flat however long the history is.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    chunk_size = 2000
+    columns = (
+        'date', 'transaction_type', 'amount', 'source', 'source_currency', 'destination', 'destination_currency',
+    )
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def perform_content_negotiation(self, request, force=False):
+        # The response isn't rendered by DRF, so don't reject e.g. `Accept: text/csv`
+        return super().perform_content_negotiation(request, force=True)
+
+    def get_queryset(self):
+        queryset = (
+            Transaction.objects.filter(user=self.request.user)
+            .select_related('source_wallet', 'destination_wallet')
+            .only(
+                'id', 'date', 'transaction_type', 'amount', 'source', 'destination',
+                'source_wallet__currency', 'destination_wallet__currency',
+            )
+            .order_by('-date', '-id')
+        )
+        return self.filter_transactions(queryset)
+
+    def get(self, request, export_format):
+        if export_format not in self.content_types:
+            raise Http404("Export format must be one of: csv, ndjson.")
+
+        rows = self.export_rows(self.get_queryset())
+        lines = self.csv_lines(rows) if export_format == 'csv' else self.ndjson_lines(rows)
+
+        response = StreamingHttpResponse(lines, content_type=self.content_types[export_format])
+        response['Content-Disposition'] = f'attachment; filename="transactions.{export_format}"'
+        return response
+
+    def export_rows(self, queryset):
+        """
+        Yield one dict per transaction.
+        """
+        for item in queryset.iterator(chunk_size=self.chunk_size):
+            source_wallet, destination_wallet = item.source_wallet, item.destination_wallet
+            if item.transaction_type == 'WITHDRAWL':
+                # The debited wallet is linked as the source, but its address stays in `destination`
+                source_wallet, destination_wallet = None, source_wallet
+            yield {
+                'date': item.date.isoformat(),
+                'transaction_type': item.transaction_type,
+                'amount': str(item.amount),
+                'source': item.source,
+                'source_currency': source_wallet.currency if source_wallet else '',
+                'destination': item.destination,
+                'destination_currency': destination_wallet.currency if destination_wallet else '',
+            }
+
+    def csv_lines(self, rows):
+        writer = csv.writer(Echo())
+        # The header goes out before the first query runs
+        yield writer.writerow(self.columns)
+        for row in rows:
+            yield writer.writerow([row[column] for column in self.columns])
+
+    def ndjson_lines(self, rows):
+        for row in rows:
+            yield json.dumps(row) + '\n'
+
+
+class TransactionStatsView(generics.ListAPIView):
+    """
+    API View to list the authenticated user's monthly activity per currency, newest month first.
+    - Reads the precomputed ActivityRollup rows, so the cost doesn't grow with the history.
+    - Optional `date_from`, `date_to` and `currency` filters.
+    """
+    serializer_class = ActivityRollupSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        serializer = ActivityStatsFilterSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = serializer.validated_data
+
+        queryset = ActivityRollup.objects.filter(user=self.request.user)
+        if 'date_from' in filters:
+            queryset = queryset.filter(month__gte=filters['date_from'].replace(day=1))
+        if 'date_to' in filters:
+            queryset = queryset.filter(month__lte=filters['date_to'])
+        if 'currency' in filters:
+            queryset = queryset.filter(currency=filters['currency'])
+
+        return queryset.order_by('-month', 'currency')
+
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.sites.shortcuts import get_current_site
 from django.urls import reverse
@@ -11,15 +12,43 @@ from rest_framework.settings import api_settings
 
 from api.permissions import user_permissions
 from api.serializers import user_serializer
+from api.throttling.token_bucket import TokenBucketThrottle
+from api.utils.conditional import conditional_response, version_etag
+from api.utils.pagination import UserCursorPagination
+from api.utils.user_list_cache import cache, user_list_cache_key
 
 
 class AllUsers(generics.ListAPIView):
 
-    """API View for listing all available users."""
+    """
+    API View for listing all available users.
+
+    - Always paginated by id, see UserCursorPagination.
+    - Only the columns UserSerializer renders are selected.
+    - Pages are cached for USER_LIST_CACHE_TTL seconds, and dropped as soon as a
+      user is created, updated or deleted (see api.signals.user_signals).
+    """
 
     permission_classes = (user_permissions.AllowAny,)
     serializer_class = user_serializer.UserSerializer
-    queryset = get_user_model().objects.all()
+    pagination_class = UserCursorPagination
+    queryset = get_user_model().objects.only(
+        'id', 'email', 'first_name', 'last_name', 'date_joined', 'date_updated', 'is_staff', 'is_active',
+    )
+
+    def list(self, request, *args, **kwargs):
+        key = user_list_cache_key(
+            request.get_host(),
+            self.paginator.get_page_size(request),
+            request.query_params.get(self.paginator.cursor_query_param),
+        )
+
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, settings.USER_LIST_CACHE_TTL)
+
+        return Response(data)
 
 
 class UserAPIView(generics.CreateAPIView):
@@ -46,13 +75,28 @@ class UserAPIView(generics.CreateAPIView):
 
 class RetrieveUserAPIView(generics.RetrieveDestroyAPIView):
 
-    """API View for retrieving, updating and deleting the user."""
+    """
+    API View for retrieving, updating and deleting the user.
+
+    Responses carry an ETag and Last-Modified derived from ``date_updated``, which
+    every save of the user bumps, so an unchanged user gets a 304 Not Modified
+    without being serialized.
+    """
 
     permission_classes = (user_permissions.IsOwnerOrReadOnly,)
     serializer_class = user_serializer.UserSerializer
 
     def get_object(self):
         return get_user_model().objects.get(email=self.kwargs.get('email'))
+
+    def retrieve(self, request, *args, **kwargs):
+        user = self.get_object()
+        return conditional_response(
+            request,
+            version_etag(user.pk, user.date_updated.isoformat()),
+            lambda: Response(self.get_serializer(user).data),
+            last_modified=user.date_updated,
+        )
     
 
 class UpdateUserAPIView(generics.RetrieveUpdateAPIView):
@@ -114,6 +158,8 @@ class AuthTokenAPIView(ObtainAuthToken):
     permission_classes = (permissions.AllowAny,)
     serializer_class = user_serializer.AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'login'
 
     
     def post(self, request, *args, **kwargs):
@@ -142,4 +188,19 @@ class AuthTokenAPIView(ObtainAuthToken):
                 'day': user.date_updated.day,
                 'time': user.date_updated.time().strftime("%H:%M:%S")
             },
-        })
\ No newline at end of file
+        })
+
+
+
+class LogoutAPIView(views.APIView):
+
+    """API View for logging out, which deletes the authentication token used for the request."""
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request):
+
+        request.auth.delete()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
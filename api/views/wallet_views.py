@@ -1,23 +1,36 @@
 import requests
+from datetime import datetime, time, timedelta
 from decimal import Decimal, InvalidOperation
 from django.http import Http404
-from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.db import IntegrityError
 
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 
+from api.models.ledger_entry import LedgerEntry
 from api.models.wallet import Wallet
-from api.models.transaction import Transaction
 
-from api.serializers.wallet_serializer import WalletSerializer, WalletDepositWithdrawSerializer, WalletTransferSerializer
+from api.serializers.wallet_serializer import (
+    WalletSerializer, WalletDepositWithdrawSerializer, WalletTransferSerializer, WalletBatchTransferSerializer,
+    WalletValuationSerializer, WalletBalanceAtSerializer, WalletStatementSerializer, LedgerEntrySerializer,
+)
 from api.permissions.wallet_permissions import IsOwnerOrReadOnly
+from api.throttling.token_bucket import TokenBucketThrottle
+from api.utils.exchange_rates import get_rate_snapshot
+from api.utils import balances
+from api.utils.conditional import conditional_response, version_etag
+from api.utils.idempotency import idempotent
+from api.utils.wallet_repository import WalletRepository
 
 class WalletListView(generics.ListCreateAPIView):
     """
     API view to list wallets or create a wallet.
     - Users can only view their own wallets.
     - Only authenticated users can create a wallet.
+    - The list has an ETag built from the (id, version) of its wallets, so an
+      unchanged list gets a `304 Not Modified` without being loaded or serialized.
     """
     queryset = Wallet.objects.all()
     serializer_class = WalletSerializer
@@ -29,6 +42,14 @@ class WalletListView(generics.ListCreateAPIView):
         """
         return Wallet.objects.filter(user=self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        versions = self.get_queryset().order_by('pk').values_list('pk', 'version')
+        return conditional_response(
+            request,
+            version_etag(request.user.pk, *(f'{pk}.{version}' for pk, version in versions)),
+            lambda: super(WalletListView, self).list(request, *args, **kwargs),
+        )
+
     def perform_create(self, serializer):
         """
         Automatically assign the logged-in user when creating a wallet.
@@ -44,6 +65,8 @@ class WalletDetailView(generics.RetrieveDestroyAPIView):
     """
     API view to retrieve, update, or delete a wallet using the user's email.
     - Only the owner of the wallet can update or delete it.
+    - The wallet's ETag comes from its version counter, so an unchanged wallet
+      gets a `304 Not Modified` without being serialized.
     """
     serializer_class = WalletSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
@@ -58,6 +81,14 @@ class WalletDetailView(generics.RetrieveDestroyAPIView):
             raise Http404("Wallet with this currency does not exist for this user.")
         return wallet
 
+    def retrieve(self, request, *args, **kwargs):
+        wallet = self.get_object()
+        return conditional_response(
+            request,
+            version_etag(wallet.pk, wallet.version),
+            lambda: Response(self.get_serializer(wallet).data),
+        )
+
 
 class WalletDepositView(generics.UpdateAPIView):
     """
@@ -67,17 +98,18 @@ class WalletDepositView(generics.UpdateAPIView):
     queryset = Wallet.objects.all()
     serializer_class = WalletDepositWithdrawSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrReadOnly)
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'deposit_withdraw'
 
     def get_object(self):
         """
-        Retrieve the wallet based on the user and currency.
+        Retrieve the wallet based on the user and currency, from the request's WalletRepository.
         """
-        currency = self.kwargs['currency']
-        wallet = Wallet.objects.filter(user=self.request.user, currency=currency).first()
-        if not wallet:
-            raise Http404("Wallet with this currency does not exist for this user.")
+        wallet = WalletRepository.for_request(self.request).get_or_404(self.kwargs['currency'])
+        self.check_object_permissions(self.request, wallet)
         return wallet
 
+    @idempotent
     def update(self, request, *args, **kwargs):
         """
         Handle PUT request to apply deposit logic.
@@ -90,16 +122,7 @@ class WalletDepositView(generics.UpdateAPIView):
 
         bank_account_address = serializer.validated_data.get('bank_account_address')
         amount = serializer.validated_data.get('amount')
-        wallet.balance += amount 
-        wallet.save()
-
-        Transaction.objects.create(
-            user=self.request.user,
-            source=bank_account_address,
-            destination=wallet.wallet_address,
-            transaction_type="DEPOSIT",
-            amount=amount,
-        )
+        wallet = balances.deposit(self.request.user, wallet, bank_account_address, amount)
 
         return Response({
             "status": "success",
@@ -119,18 +142,18 @@ class WalletWithdrawView(generics.UpdateAPIView):
     queryset = Wallet.objects.all()
     serializer_class = WalletDepositWithdrawSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrReadOnly)
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'deposit_withdraw'
 
     def get_object(self):
         """
-        Retrieve the wallet based on the user and currency.
+        Retrieve the wallet based on the user and currency, from the request's WalletRepository.
         """
-        currency = self.kwargs['currency']
-        wallet = Wallet.objects.filter(user=self.request.user, currency=currency).first()
-
-        if not wallet:
-            raise Http404("Wallet with this currency does not exist for this user.")
+        wallet = WalletRepository.for_request(self.request).get_or_404(self.kwargs['currency'])
+        self.check_object_permissions(self.request, wallet)
         return wallet
 
+    @idempotent
     def update(self, request, *args, **kwargs):
         """
         Override update to apply withdrawal logic.
@@ -144,20 +167,11 @@ class WalletWithdrawView(generics.UpdateAPIView):
         bank_account_address = serializer.validated_data['bank_account_address']
         amount = serializer.validated_data.get('amount')
 
-        # Check if withdrawal amount is greater than available balance
-        if amount > wallet.balance:
+        # The balance is checked again under the row lock
+        try:
+            wallet = balances.withdraw(self.request.user, wallet, bank_account_address, amount)
+        except balances.InsufficientFunds:
             raise ValidationError("Insufficient balance for this withdrawal.")
-        
-        wallet.balance -= amount 
-        wallet.save()
-
-        Transaction.objects.create(
-            user=self.request.user,
-            source=bank_account_address,
-            destination=wallet.wallet_address,
-            transaction_type="WITHDRAWL",
-            amount=amount,
-        )
 
         return Response({
             "status": "success",
@@ -174,48 +188,30 @@ class WalletTransferView(generics.GenericAPIView):
     """
     API View to transfer money between two wallets with different currencies, 
     using exchange rates from the NBP API.
+    - The user's wallets are loaded once per request (see WalletRepository), for
+      both validation and the transfer itself.
     """
     serializer_class = WalletTransferSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrReadOnly)
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'transfer'
 
-    def fetch_exchange_rate(self, source_currency, destination_currency):
+    def fetch_exchange_rate(self, source_currency, destination_currency, snapshot=None):
         """
         Fetch exchange rates from the NBP API and calculate the rate for conversion.
+        Both rates come from one cached snapshot of NBP table A, stored locally, so
+        pricing a pair costs at most one NBP request per table publication.
+        Pass `snapshot` to price several pairs from the same table.
+        Returns the rate together with the snapshot it was calculated from.
         """
         try:
-            # If source currency is PLN, return 1 since it's already in PLN
-            if source_currency == 'PLN' and destination_currency == 'PLN':
-                return Decimal(1)
-
-            # If source currency is PLN, convert to destination currency rate
-            if source_currency == 'PLN':
-                response = requests.get(f'https://api.nbp.pl/api/exchangerates/rates/a/{destination_currency}/')
-                response.raise_for_status()
-                destination_rate = response.json().get('rates')[0].get('mid')
-                return Decimal(1) / Decimal(destination_rate)  # Invert since source is PLN
-
-            # If destination currency is PLN, convert source currency to PLN rate
-            if destination_currency == 'PLN':
-                response = requests.get(f'https://api.nbp.pl/api/exchangerates/rates/a/{source_currency}/')
-                response.raise_for_status()
-                source_rate = response.json().get('rates')[0].get('mid')
-                return Decimal(source_rate)  # Direct conversion to PLN
-
-            # Otherwise, fetch both source and destination rates for conversion
-            source_response = requests.get(f'https://api.nbp.pl/api/exchangerates/rates/a/{source_currency}/')
-            source_response.raise_for_status()
-            source_rate = source_response.json().get('rates')[0].get('mid')
-
-            destination_response = requests.get(f'https://api.nbp.pl/api/exchangerates/rates/a/{destination_currency}/')
-            destination_response.raise_for_status()
-            destination_rate = destination_response.json().get('rates')[0].get('mid')
-
-            # Calculate the correct exchange rate for conversion
-            return Decimal(source_rate) / Decimal(destination_rate)
+            snapshot = snapshot or get_rate_snapshot()
+            return snapshot.cross_rate(source_currency, destination_currency), snapshot
         except (requests.RequestException, KeyError, InvalidOperation) as e:
             raise ValidationError(f"Failed to fetch exchange rates: {str(e)}")
 
 
+    @idempotent
     def post(self, request, *args, **kwargs):
         """
         Handle POST request to transfer money between wallets with currency conversion.
@@ -227,9 +223,10 @@ class WalletTransferView(generics.GenericAPIView):
         destination_currency = serializer.validated_data['destination_currency']
         amount = serializer.validated_data['amount']  # Amount in source currency
 
-        # Retrieve wallets
-        source_wallet = Wallet.objects.filter(user=request.user, currency=source_currency).first()
-        destination_wallet = Wallet.objects.filter(user=request.user, currency=destination_currency).first()
+        # Retrieve wallets, loaded once with the currency choices of the serializer
+        wallets = WalletRepository.for_request(request)
+        source_wallet = wallets.get(source_currency)
+        destination_wallet = wallets.get(destination_currency)
 
         if source_wallet is None or destination_wallet is None:
             return Response(
@@ -245,23 +242,19 @@ class WalletTransferView(generics.GenericAPIView):
             )
 
         # Fetch the correct exchange rate and calculate the converted amount
-        exchange_rate = self.fetch_exchange_rate(source_currency, destination_currency)
-        converted_amount = Decimal(amount) * exchange_rate
-
-        # Perform the transfer
-        source_wallet.balance -= Decimal(amount)
-        source_wallet.save()
-
-        destination_wallet.balance += converted_amount
-        destination_wallet.save()
-
-        Transaction.objects.create(
-            user=self.request.user,
-            source=source_wallet.wallet_address,
-            destination=destination_wallet.wallet_address,
-            transaction_type="TRANSFER",
-            amount=amount,
-        )
+        exchange_rate, snapshot = self.fetch_exchange_rate(source_currency, destination_currency)
+        converted_amount = balances.credited_amount(Decimal(amount) * exchange_rate)
+
+        # Perform the transfer; the balance may have changed while the rate was fetched
+        try:
+            source_wallet, destination_wallet = balances.transfer(
+                self.request.user, source_wallet, destination_wallet, amount, converted_amount, snapshot
+            )
+        except balances.InsufficientFunds:
+            return Response(
+                {"error": "Insufficient funds in the source wallet."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         return Response({
             "status": "success",
@@ -274,3 +267,177 @@ class WalletTransferView(generics.GenericAPIView):
             "destination_amount": str(converted_amount)  # Transferred amount in destination currency
         }, status=status.HTTP_200_OK)
 
+
+class WalletBatchTransferView(WalletTransferView):
+    """
+    API View to execute a list of transfers between the user's wallets at once.
+    - Every leg is priced from the same NBP table snapshot.
+    - Legs are applied in order within one database transaction: either all of
+      them are committed or, if any leg lacks funds, none is.
+    """
+    serializer_class = WalletBatchTransferSerializer
+
+    @idempotent
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        transfers = serializer.validated_data['transfers']
+
+        wallets = WalletRepository.for_request(request).all()
+        snapshot = None
+        legs = []
+
+        for transfer in transfers:
+            exchange_rate, snapshot = self.fetch_exchange_rate(
+                transfer['source_currency'], transfer['destination_currency'], snapshot
+            )
+            legs.append({
+                'source_wallet': wallets[transfer['source_currency']],
+                'destination_wallet': wallets[transfer['destination_currency']],
+                'amount': transfer['amount'],
+                'exchange_rate': exchange_rate,
+                'converted_amount': balances.credited_amount(Decimal(transfer['amount']) * exchange_rate),
+            })
+
+        try:
+            results = balances.batch_transfer(request.user, legs, snapshot)
+        except balances.InsufficientFunds as e:
+            return Response(
+                {"error": "Insufficient funds in the source wallet.", "transfer": e.leg},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({
+            "status": "success",
+            "exchange_rate_table": snapshot.number,
+            "transfers": [
+                {
+                    "source_currency": leg['source_wallet'].currency,
+                    "destination_currency": leg['destination_wallet'].currency,
+                    "source_balance": str(source_balance),
+                    "destination_balance": str(destination_balance),
+                    "exchange_rate": str(leg['exchange_rate']),
+                    "source_amount": str(leg['amount']),
+                    "destination_amount": str(leg['converted_amount'])
+                }
+                for leg, (source_balance, destination_balance) in zip(legs, results)
+            ],
+        }, status=status.HTTP_200_OK)
+
+
+class WalletValuationView(generics.GenericAPIView):
+    """
+    API View to value all of the user's wallets in one currency.
+    - Balances are loaded in one query and converted with one rate snapshot,
+      so the cost doesn't depend on how many currencies the user holds.
+    - Wallets in a currency NBP doesn't quote have a `null` value and are left
+      out of the total.
+    """
+    serializer_class = WalletValuationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        currency = serializer.validated_data['currency']
+
+        try:
+            snapshot = get_rate_snapshot()
+        except requests.RequestException as e:
+            raise ValidationError(f"Failed to fetch exchange rates: {str(e)}")
+
+        if currency not in snapshot:
+            raise ValidationError({"currency": [f"No exchange rate available for {currency}."]})
+
+        wallets = []
+        total = Decimal(0)
+        for wallet_currency, wallet_address, balance in (
+            Wallet.objects.filter(user=request.user).order_by('currency')
+            .values_list('currency', 'wallet_address', 'balance')
+        ):
+            if wallet_currency in snapshot:
+                exchange_rate = snapshot.cross_rate(wallet_currency, currency)
+                value = (balance * exchange_rate).quantize(balances.CENT)
+                total += value
+            else:
+                exchange_rate = value = None
+
+            wallets.append({
+                "currency": wallet_currency,
+                "wallet_address": wallet_address,
+                "balance": str(balance),
+                "exchange_rate": None if exchange_rate is None else str(exchange_rate),
+                "value": None if value is None else str(value),
+            })
+
+        return Response({
+            "currency": currency,
+            "total": str(total),
+            "exchange_rate_table": snapshot.number,
+            "effective_date": snapshot.effective_date,
+            "wallets": wallets,
+        }, status=status.HTTP_200_OK)
+
+
+class WalletLedgerMixin:
+    """
+    Resolves the user's wallet by currency and validates the query parameters.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self):
+        wallet = Wallet.objects.filter(user=self.request.user, currency=self.kwargs['currency']).first()
+        if not wallet:
+            raise Http404("Wallet with this currency does not exist for this user.")
+        return wallet
+
+    def get_params(self):
+        serializer = self.get_serializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+
+class WalletBalanceAtView(WalletLedgerMixin, generics.GenericAPIView):
+    """
+    API View to get the balance a wallet had at a point in time.
+    - Answered by the wallet's latest ledger entry at that time, a single index lookup.
+    - Balances before the ledger was introduced aren't known and are reported as 0.
+    """
+    serializer_class = WalletBalanceAtSerializer
+
+    def get(self, request, *args, **kwargs):
+        wallet = self.get_object()
+        at = self.get_params()['at']
+
+        return Response({
+            "currency": wallet.currency,
+            "at": at,
+            "balance": str(LedgerEntry.objects.balance_at(wallet, at)),
+        })
+
+
+class WalletStatementView(WalletLedgerMixin, generics.GenericAPIView):
+    """
+    API View to get a wallet statement: the opening balance, every ledger entry
+    between two days (inclusive) and the closing balance.
+    """
+    serializer_class = WalletStatementSerializer
+
+    def get(self, request, *args, **kwargs):
+        wallet = self.get_object()
+        params = self.get_params()
+        start = timezone.make_aware(datetime.combine(params['date_from'], time.min))
+        end = timezone.make_aware(datetime.combine(params['date_to'] + timedelta(days=1), time.min))
+
+        entries = LedgerEntrySerializer(LedgerEntry.objects.statement(wallet, start, end), many=True).data
+        opening_balance = LedgerEntry.objects.balance_at(wallet, start - timedelta(microseconds=1))
+
+        return Response({
+            "currency": wallet.currency,
+            "date_from": params['date_from'],
+            "date_to": params['date_to'],
+            "opening_balance": str(opening_balance),
+            "closing_balance": entries[-1]['balance'] if entries else str(opening_balance),
+            "entries": entries,
+        })
+
@@ -0,0 +1,110 @@
+"""
+Benchmark of the onboard_users command against creating users one at a time.
+
+Writes a CSV of --users users and imports it into a throwaway SQLite database with
+`onboard_users`, then creates --baseline users one by one with UserManager.create_user
+(one password hash, user INSERT, post_save signal and wallet INSERT each) in a fresh
+database. Reports users per second for both. With --fast-hasher both use Django's
+MD5 hasher, which isolates the database work from password hashing; the default is
+the project's PBKDF2 hasher, whose cost is spread over --workers processes.
+
+Usage:
+
+    python benchmarks/bulk_onboarding.py --users 100000 --baseline 5000 --fast-hasher
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=100000, help='Users in the onboarded file')
+    parser.add_argument('--baseline', type=int, default=2000, help='Users created one at a time for comparison')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Password hashing processes')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Users created per database transaction')
+    parser.add_argument('--fast-hasher', action='store_true', help='Hash with MD5 to measure the database work only')
+    return parser.parse_args()
+
+
+def setup_django(database, fast_hasher):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'core.settings'
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = database
+    if fast_hasher:
+        # Inherited by the forked hashing processes
+        settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def use_database(database):
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+
+    connection.close()
+    settings.DATABASES['default']['NAME'] = database
+    connection.settings_dict['NAME'] = database
+    call_command('migrate', verbosity=0)
+
+
+def write_users(path, count, prefix):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(('email', 'first_name', 'last_name', 'password'))
+        for i in range(count):
+            writer.writerow((f'{prefix}{i}@example.com', 'Bench', 'User', f'password-{i}'))
+
+
+def onboard(path, workers, chunk_size):
+    from django.core.management import call_command
+
+    started = time.perf_counter()
+    call_command('onboard_users', str(path), workers=workers, chunk_size=chunk_size, stdout=io.StringIO())
+    return time.perf_counter() - started
+
+
+def one_at_a_time(count):
+    from api.models.user import User
+
+    started = time.perf_counter()
+    for i in range(count):
+        User.objects.create_user('Bench', 'User', f'single{i}@example.com', f'password-{i}')
+    return time.perf_counter() - started
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / 'bulk.sqlite3'), args.fast_hasher)
+        from api.models.user import User
+        from api.models.wallet import Wallet
+
+        path = Path(tmp) / 'users.csv'
+        write_users(path, args.users, 'bulk')
+        elapsed = onboard(path, args.workers, args.chunk_size)
+        assert User.objects.count() == args.users and Wallet.objects.count() == args.users
+        print(f'onboard_users   {args.users:>8} users  {elapsed:>8.1f} s  {args.users / elapsed:>8.0f} users/s')
+
+        use_database(str(Path(tmp) / 'single.sqlite3'))
+        elapsed = one_at_a_time(args.baseline)
+        print(f'create_user     {args.baseline:>8} users  {elapsed:>8.1f} s  {args.baseline / elapsed:>8.0f} users/s')
+
+
+if __name__ == '__main__':
+    main()
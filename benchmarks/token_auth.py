@@ -0,0 +1,95 @@
+"""
+Benchmark of DRF's TokenAuthentication against CachedTokenAuthentication on `GET /api/wallets/`.
+
+Both runs use the same throwaway SQLite database and users; every request uses
+one of --users tokens, so after the first request per token the cached class
+resolves the user from the cache. Reports queries per request and throughput.
+
+Usage:
+
+    python benchmarks/token_auth.py --requests 2000 --users 50
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per authentication class')
+    parser.add_argument('--users', type=int, default=50, help='Users (and tokens) the requests are spread over')
+    return parser.parse_args()
+
+
+def setup_django(database):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'core.settings'
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = database
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def create_users(count):
+    from rest_framework.authtoken.models import Token
+    from api.models.user import User
+
+    return [
+        Token.objects.create(user=User.objects.create_user('Bench', 'User', f'bench{i}@example.com', 'password')).key
+        for i in range(count)
+    ]
+
+
+def run(name, authentication_class, tokens, requests):
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from api.authentication.token_authentication import cache
+    from api.views.wallet_views import WalletListView
+
+    WalletListView.authentication_classes = [authentication_class]
+    cache.clear()
+    client = Client()
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for i in range(requests):
+            response = client.get('/api/wallets/', headers={'Authorization': f'Token {tokens[i % len(tokens)]}'})
+            assert response.status_code == 200, response.content
+        elapsed = time.perf_counter() - started
+
+    print(
+        f'{name:<28} {len(queries) / requests:>6.2f} queries/request   '
+        f'{requests / elapsed:>8.1f} req/s   {elapsed / requests * 1000:>6.2f} ms/request'
+    )
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / 'bench.sqlite3'))
+
+        from rest_framework.authentication import TokenAuthentication
+        from api.authentication.token_authentication import CachedTokenAuthentication
+
+        tokens = create_users(args.users)
+
+        print(f'{args.requests} requests to GET /api/wallets/ over {args.users} tokens')
+        run('TokenAuthentication', TokenAuthentication, tokens, args.requests)
+        run('CachedTokenAuthentication', CachedTokenAuthentication, tokens, args.requests)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark of the filtered transaction history endpoint on a synthetic table of millions of rows.
+
+Fills a throwaway SQLite database step by step up to the largest --sizes value and,
+at every step, times one page of `GET /api/transactions/` for each filter. The
+benchmarked user owns a fixed --user-rows transactions; every other row belongs
+to other users, so flat timings across steps mean the filters don't scan the table.
+
+Usage:
+
+    python benchmarks/transaction_filters.py --sizes 100000,1000000,3000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+FILTERS = {
+    'none': '',
+    'date range': '?date_from={month_ago}&date_to={today}',
+    'transaction_type': '?transaction_type=WITHDRAWL',
+    'currency': '?currency=EUR',
+    'counterparty prefix': '?counterparty=PL12',
+    'type + date range': '?transaction_type=DEPOSIT&date_from={month_ago}&date_to={today}',
+}
+
+CURRENCIES = ('PLN', 'USD', 'EUR')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='100000,1000000,2000000', help='Comma separated table sizes to measure at')
+    parser.add_argument('--users', type=int, default=2000, help='Users owning the generated transactions')
+    parser.add_argument('--user-rows', type=int, default=20000, help='Transactions of the benchmarked user')
+    parser.add_argument('--repeat', type=int, default=20, help='Requests per filter and size')
+    return parser.parse_args()
+
+
+def setup_django(database):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'core.settings'
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = database
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def create_users(count):
+    from django.contrib.auth.hashers import make_password
+    from rest_framework.authtoken.models import Token
+    from api.models.user import User
+    from api.models.wallet import Wallet
+
+    password = make_password('password')
+    users = User.objects.bulk_create(
+        User(email=f'bench{i}@example.com', first_name='Bench', last_name='User', password=password)
+        for i in range(count)
+    )
+    Wallet.objects.bulk_create(
+        Wallet(user=user, currency=currency, wallet_address=f'{uuid.uuid4().hex[:18]}{user.pk}')
+        for user in users for currency in CURRENCIES
+    )
+
+    wallets = {}
+    for user_id, pk, address in Wallet.objects.values_list('user_id', 'pk', 'wallet_address'):
+        wallets.setdefault(user_id, []).append((pk, address))
+
+    return Token.objects.create(user=users[0]).key, users[0].pk, wallets
+
+
+def insert_rows(count, user_ids, wallets, now):
+    from django.db import connection, transaction
+
+    def row(user_id):
+        own = wallets[user_id]
+        kind = random.choice(('DEPOSIT', 'WITHDRAWL', 'TRANSFER'))
+        if kind == 'TRANSFER':
+            (source_wallet, source), (destination_wallet, destination) = random.sample(own, 2)
+            bank_account = ''
+        else:
+            source_wallet, source = None, f'PL{random.randrange(10 ** 8):08d}'
+            destination_wallet, destination = random.choice(own)
+            bank_account = source
+        date = now - timedelta(seconds=random.randrange(365 * 24 * 3600))
+        return (
+            user_id, source, destination, source_wallet, destination_wallet, bank_account, kind,
+            random.randrange(1, 10 ** 5), date.strftime('%Y-%m-%d %H:%M:%S.%f'),
+        )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, count, 50000):
+            cursor.executemany(
+                'INSERT INTO api_transaction (user_id, source, destination, source_wallet_id, destination_wallet_id, '
+                'bank_account, transaction_type, amount, date) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)',
+                [row(random.choice(user_ids)) for _ in range(min(50000, count - start))]
+            )
+
+
+def measure(token, repeat, now):
+    from django.test import Client
+
+    client = Client()
+    headers = {'Authorization': f'Token {token}'}
+    placeholders = {'today': now.date().isoformat(), 'month_ago': (now - timedelta(days=30)).date().isoformat()}
+    timings = {}
+
+    for name, query in FILTERS.items():
+        url = '/api/transactions/' + query.format(**placeholders)
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = client.get(url, headers=headers)
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.content
+        timings[name] = statistics.median(samples) * 1000
+
+    return timings
+
+
+def main():
+    args = parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+    now = datetime.utcnow()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(str(Path(tmp) / 'bench.sqlite3'))
+        token, user_id, wallets = create_users(args.users)
+        other_users = [pk for pk in wallets if pk != user_id]
+
+        insert_rows(args.user_rows, [user_id], wallets, now)
+        total = args.user_rows
+
+        print(f'{"rows":>10}  ' + '  '.join(f'{name:>20}' for name in FILTERS) + '   (median ms per page)')
+        for size in sizes:
+            if size > total:
+                insert_rows(size - total, other_users, wallets, now)
+                total = size
+
+            timings = measure(token, args.repeat, now)
+            print(f'{total:>10}  ' + '  '.join(f'{timings[name]:>20.2f}' for name in FILTERS))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Side-by-side benchmark of the WSGI `WalletTransferView` and the ASGI `AsyncWalletTransferView`.
+
+Both views run in process against a throwaway SQLite database and a local
+FakeNBPServer with injected latency. The rate cache is disabled so every transfer
+has to wait on NBP, which is the case where a blocked worker matters:
+
+    - WSGI: --workers threads, each handling one request at a time (like sync workers).
+    - ASGI: one event loop with up to --concurrency requests in flight.
+
+Concurrent misses are still coalesced into one NBP call on both paths, as in production.
+
+Usage:
+
+    python benchmarks/transfer_wsgi_vs_asgi.py --requests 1000 --concurrency 200 --workers 8 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.utils.fake_nbp_server import FakeNBPServer  # noqa: E402  (no Django imports)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=500, help='Transfers per run')
+    parser.add_argument('--concurrency', type=int, default=200, help='In-flight requests on the ASGI loop')
+    parser.add_argument('--workers', type=int, default=8, help='WSGI worker threads')
+    parser.add_argument('--users', type=int, default=50, help='Users the transfers are spread over')
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds the fake NBP API takes to answer')
+    return parser.parse_args()
+
+
+def setup_django(nbp_url, database):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'core.settings'
+    os.environ['NBP_API_URL'] = nbp_url
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = database
+    settings.DATABASES['default']['OPTIONS']['timeout'] = 60
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+    from api.utils import exchange_rates
+
+    # Every transfer goes to NBP: nothing is fresh in memory or in the ExchangeRate table
+    exchange_rates.rate_cache.ttl = 0
+    exchange_rates.rate_cache.stale_ttl = 0
+    exchange_rates.rate_cache.publication_time = None
+    exchange_rates.last_publication_date = lambda *args: date.max
+
+
+def create_users(count):
+    from rest_framework.authtoken.models import Token
+    from api.models.user import User
+    from api.models.wallet import Wallet
+
+    tokens = []
+    for i in range(count):
+        user = User.objects.create_user('Bench', 'User', f'bench{i}@example.com', 'password')
+        Wallet.objects.create(user=user, currency='USD')
+        Wallet.objects.filter(user=user).update(balance=10 ** 9)
+        tokens.append(Token.objects.create(user=user).key)
+    return tokens
+
+
+def summarize(name, latencies, statuses, elapsed, nbp_calls):
+    latencies = sorted(latencies)
+    quantiles = statistics.quantiles(latencies, n=100)
+    errors = sum(1 for code in statuses if code != 200)
+
+    print(
+        f'{name:<5} {len(latencies) / elapsed:>9.1f} req/s   '
+        f'p50 {quantiles[49] * 1000:>7.1f} ms   p95 {quantiles[94] * 1000:>7.1f} ms   '
+        f'p99 {quantiles[98] * 1000:>7.1f} ms   errors {errors}   NBP calls {nbp_calls}'
+    )
+
+
+def run_wsgi(tokens, args, server):
+    from django.db import connections
+    from django.test import Client
+
+    payload = {'source_currency': 'PLN', 'destination_currency': 'USD', 'amount': '1.00'}
+
+    def transfer(i):
+        started = time.perf_counter()
+        response = Client().post(
+            '/api/wallets/transfer/', payload,
+            headers={'Authorization': f'Token {tokens[i % len(tokens)]}'}
+        )
+        connections.close_all()
+        return time.perf_counter() - started, response.status_code
+
+    server.request_count = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(transfer, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    summarize('WSGI', [r[0] for r in results], [r[1] for r in results], elapsed, server.request_count)
+
+
+def run_asgi(tokens, args, server):
+    from django.test import AsyncClient
+
+    payload = {'source_currency': 'PLN', 'destination_currency': 'USD', 'amount': '1.00'}
+
+    async def main():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def transfer(i):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    '/api/wallets/async/transfer/', payload,
+                    headers={'Authorization': f'Token {tokens[i % len(tokens)]}'}
+                )
+                return time.perf_counter() - started, response.status_code
+
+        return await asyncio.gather(*(transfer(i) for i in range(args.requests)))
+
+    server.request_count = 0
+    started = time.perf_counter()
+    results = asyncio.run(main())
+    elapsed = time.perf_counter() - started
+
+    summarize('ASGI', [r[0] for r in results], [r[1] for r in results], elapsed, server.request_count)
+
+
+def main():
+    args = parse_args()
+
+    with FakeNBPServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        setup_django(server.url, str(Path(tmp) / 'bench.sqlite3'))
+        tokens = create_users(args.users)
+
+        print(
+            f'{args.requests} transfers, NBP latency {args.latency * 1000:.0f} ms, '
+            f'{args.workers} WSGI workers vs {args.concurrency} in-flight ASGI requests'
+        )
+        run_wsgi(tokens, args, server)
+        run_asgi(tokens, args, server)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 from api.utils import ip_address
 
@@ -82,13 +83,89 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# Set POSTGRES_DB (requires the `psycopg[pool]` package) to run on PostgreSQL, e.g. in production.
+
+if os.environ.get('POSTGRES_DB'):
+    POSTGRES_POOL = os.environ.get('POSTGRES_POOL', '1') == '1'
+
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ['POSTGRES_DB'],
+            'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            # Without the pool, keep each worker's connection open between requests instead
+            'CONN_MAX_AGE': 0 if POSTGRES_POOL else int(os.environ.get('POSTGRES_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': not POSTGRES_POOL,
+            'OPTIONS': {
+                # Milliseconds; a runaway query fails instead of holding a connection and its row locks.
+                # Raise it for long management commands, e.g. POSTGRES_STATEMENT_TIMEOUT=0 (no limit)
+                'options': f"-c statement_timeout={os.environ.get('POSTGRES_STATEMENT_TIMEOUT', 5000)}",
+            },
+        }
+    }
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+    if POSTGRES_POOL:
+        # psycopg connection pool shared by the threads of a worker process, see
+        # https://docs.djangoproject.com/en/5.1/ref/databases/#connection-pool
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('POSTGRES_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('POSTGRES_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('POSTGRES_POOL_TIMEOUT', 10)),  # Seconds to wait for a free connection
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # SQLite ignores SELECT ... FOR UPDATE: take the write lock when a transaction
+                # starts, so concurrent balance updates wait for each other instead of failing
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+        }
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Set REDIS_URL (requires the `redis` package) to share every cache between hosts.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        alias: {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+            'KEY_PREFIX': alias,
+        }
+        for alias in ('default', 'shared', 'throttle')
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        # Shared by every worker process on the host, so invalidating an entry (a token
+        # on logout, the user list on a signup) takes effect in all workers at once.
+        # Kept out of the world-writable temp directory: entries are unpickled when read
+        'shared': {
+            'BACKEND': 'api.utils.file_cache.FileBasedCache',
+            'LOCATION': os.environ.get('SHARED_CACHE_DIR', BASE_DIR / 'cache' / 'shared'),
+            # Tokens of the users active within TOKEN_CACHE_TTL, and user list pages
+            'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('SHARED_CACHE_MAX_ENTRIES', 10000))},
+        },
+        # Shared by every worker process on the host, so rate limits hold across workers.
+        # Kept out of the world-writable temp directory: entries are unpickled when read
+        'throttle': {
+            'BACKEND': 'api.utils.file_cache.FileBasedCache',
+            'LOCATION': os.environ.get('THROTTLE_CACHE_DIR', BASE_DIR / 'cache' / 'throttle'),
+            # One bucket per scope and client; well above the clients active within a minute
+            'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('THROTTLE_CACHE_MAX_ENTRIES', 10000))},
+        },
     }
-}
 
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -114,11 +191,20 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.token_authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Reverse proxies in front of the app. Anonymous clients (login) are told apart by the
+    # address the last of them saw, never by a client-supplied X-Forwarded-For
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+    # Token buckets of TokenBucketThrottle: the burst size per period, refilled evenly over it
+    'DEFAULT_THROTTLE_RATES': {
+        'login': '10/min',  # Per IP; every attempt runs the password hasher
+        'transfer': '30/min',  # Per user; transfers may call the NBP API
+        'deposit_withdraw': '60/min',  # Per user
+    },
 }
 
 
@@ -140,6 +226,38 @@ SWAGGER_SETTINGS = {
 
 
 
+# Exchange rates
+# NBP publishes table A once per business day, around 12:15 Warsaw time.
+
+NBP_API_URL = os.environ.get('NBP_API_URL', 'https://api.nbp.pl/api')  # Point at `manage.py fake_nbp_server` to work offline
+NBP_CONNECT_TIMEOUT = 3.05  # Seconds
+NBP_READ_TIMEOUT = 5  # Seconds
+NBP_MAX_RETRIES = 2  # Extra attempts after a connection error, timeout, 429 or 5xx
+NBP_RETRY_BACKOFF = 0.25  # Base of the jittered exponential backoff, in seconds
+NBP_POOL_SIZE = 10  # Keep-alive connections held per worker process
+NBP_CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failed calls before the circuit opens
+NBP_CIRCUIT_RESET_TIMEOUT = 30  # Seconds the circuit stays open before a trial call
+NBP_PUBLICATION_TIME = '12:15'  # Cached rates expire at the next publication (Europe/Warsaw)
+EXCHANGE_RATE_CACHE_TTL = 60 * 60 * 24  # Upper bound in seconds a fetched rate is served as fresh
+EXCHANGE_RATE_CACHE_STALE_TTL = 60 * 60  # Seconds a stale rate is still served while it is refreshed
+
+
+# Authentication
+
+TOKEN_CACHE_TTL = 60  # Seconds a token -> user lookup is cached; tokens are also dropped on logout and user changes
+
+
+# Users
+
+USER_LIST_CACHE_TTL = 60  # Seconds a page of GET /users/ is cached; pages are also dropped on user changes
+
+
+# Idempotency keys
+
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24  # Seconds a stored response is replayed before `expire_idempotency_keys` drops it
+IDEMPOTENCY_CLAIM_TIMEOUT = 60 * 2  # Seconds before an unfinished request's key can be claimed again; well above the longest request
+
+
 LOGIN_URL = '/admin/login/'  # Redirects to the Django admin login
 
 
@@ -166,4 +284,12 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-AUTH_USER_MODEL = 'api.User'
\ No newline at end of file
+AUTH_USER_MODEL = 'api.User'
+
+# System checks
+
+SILENCED_SYSTEM_CHECKS = [
+    # Covering indexes (Index.include) are PostgreSQL only; SQLite builds them without the
+    # included columns, which is all the development setup needs
+    'models.W040',
+]
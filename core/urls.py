@@ -43,5 +43,6 @@ urlpatterns = [
     path('api/users/', include('api.urls.user_urls')),
     path('api/wallets/', include('api.urls.wallet_urls')),
     path('api/transactions/', include('api.urls.transactions_urls')),
+    path('api/rates/', include('api.urls.rate_urls')),
     path('', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)